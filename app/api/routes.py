@@ -19,10 +19,12 @@ Last Updated: 2025-10-28
 """
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Header, Query
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from typing import List, Dict, Any, Optional
 import logging
 import os
+import tempfile
+import traceback
 import uuid
 import zipfile
 from datetime import datetime
@@ -55,6 +57,9 @@ from app.services.activity_logs_service import activity_logs_service
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["Insurance Quotes"])
 
+# Rendered PDFs larger than this are spooled to disk instead of memory while streaming
+PDF_SPOOL_MAX_SIZE = 2 * 1024 * 1024  # 2MB
+
 
 # ============================================================================
 # UTILITY FUNCTIONS
@@ -68,6 +73,15 @@ def _generate_comparison_id() -> str:
     return f"cmp_{timestamp}_{unique_id}"
 
 
+def _iter_pdf_file(pdf_file, chunk_size: int = 64 * 1024):
+    """Yield a rendered PDF from its spool file in chunks, closing the file when done."""
+    try:
+        while chunk := pdf_file.read(chunk_size):
+            yield chunk
+    finally:
+        pdf_file.close()
+
+
 async def _save_uploaded_file(file: UploadFile, upload_dir: str) -> Dict[str, Any]:
     """
     Save uploaded file to disk and return file data including binary content.
@@ -564,8 +578,6 @@ async def compare_insurance_quotes(
             logger.info(f"   Company ID: {company_id or 'None (individual account)'}")
         except Exception as mongo_error:
             logger.error(f"❌ MongoDB save failed for comparison: {mongo_error}")
-            import traceback
-
             logger.error(traceback.format_exc())
             # Don't fail the request, but log the error
             logger.warning("⚠️  Comparison completed but not saved to MongoDB")
@@ -800,8 +812,6 @@ async def get_user_documents(
         return JSONResponse(content={"total": len(documents), "documents": documents})
     except Exception as e:
         logger.error(f"❌ Error getting user documents: {e}")
-        import traceback
-
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -931,12 +941,14 @@ async def download_comparison_pdfs(
 
         # If both reports requested, generate both PDFs and return JSON with base64 data
         if report_type == "both":
-            # Generate both PDFs
-            strategic_memo_buffer = pdf_generator_service.generate_strategic_memo_pdf(
-                comparison_data=comp_data, comparison_id=comparison_id
-            )
-            detailed_comparison_buffer = pdf_generator_service.generate_detailed_comparison_pdf(
-                comparison_data=comp_data, comparison_id=comparison_id
+            # Generate both PDFs (rendered in worker threads, off the event loop)
+            strategic_memo_buffer, detailed_comparison_buffer = await asyncio.gather(
+                asyncio.to_thread(
+                    pdf_generator_service.generate_strategic_memo_pdf, comp_data, comparison_id
+                ),
+                asyncio.to_thread(
+                    pdf_generator_service.generate_detailed_comparison_pdf, comp_data, comparison_id
+                ),
             )
             
             strategic_memo_bytes = strategic_memo_buffer.getvalue()
@@ -973,19 +985,19 @@ async def download_comparison_pdfs(
 
         # Generate the requested PDF
         if report_type == "strategic-memo":
-            pdf_buffer = pdf_generator_service.generate_strategic_memo_pdf(
-                comparison_data=comp_data, comparison_id=comparison_id
+            pdf_buffer = await asyncio.to_thread(
+                pdf_generator_service.generate_strategic_memo_pdf, comp_data, comparison_id
             )
             filename = f"Strategic_Memo_{comparison_id}_{timestamp}.pdf"
         elif report_type == "detailed-comparison":
-            pdf_buffer = pdf_generator_service.generate_detailed_comparison_pdf(
-                comparison_data=comp_data, comparison_id=comparison_id
+            pdf_buffer = await asyncio.to_thread(
+                pdf_generator_service.generate_detailed_comparison_pdf, comp_data, comparison_id
             )
             filename = f"HAKEM_AI_Detailed_Technical_Comparison_{comparison_id}_{timestamp}.pdf"
         else:
             # Default: strategic memo
-            pdf_buffer = pdf_generator_service.generate_strategic_memo_pdf(
-                comparison_data=comp_data, comparison_id=comparison_id
+            pdf_buffer = await asyncio.to_thread(
+                pdf_generator_service.generate_strategic_memo_pdf, comp_data, comparison_id
             )
             filename = f"Strategic_Memo_{comparison_id}_{timestamp}.pdf"
 
@@ -1010,7 +1022,6 @@ async def download_comparison_pdfs(
         raise
     except Exception as e:
         logger.error(f"❌ Error generating PDF: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Failed to generate PDF: {str(e)}")
 
@@ -1062,8 +1073,8 @@ async def download_strategic_memo_pdf(
             }
 
         # Generate Strategic Memo PDF
-        pdf_buffer = pdf_generator_service.generate_strategic_memo_pdf(
-            comparison_data=comp_data, comparison_id=comparison_id
+        pdf_buffer = await asyncio.to_thread(
+            pdf_generator_service.generate_strategic_memo_pdf, comp_data, comparison_id
         )
 
         # Get PDF bytes
@@ -1092,7 +1103,6 @@ async def download_strategic_memo_pdf(
         raise
     except Exception as e:
         logger.error(f"❌ Error generating Strategic Memo PDF: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Failed to generate Strategic Memo PDF: {str(e)}")
 
@@ -1148,29 +1158,34 @@ async def download_detailed_comparison_pdf(
                 "provider_cards": comparison_data.get("provider_cards", []),
             }
 
-        # Generate Detailed Comparison PDF
-        pdf_buffer = pdf_generator_service.generate_detailed_comparison_pdf(
-            comparison_data=comp_data, comparison_id=comparison_id
-        )
-
-        # Get PDF bytes
-        pdf_bytes = pdf_buffer.getvalue()
+        # Generate Detailed Comparison PDF into a spool file: kept in memory up to
+        # PDF_SPOOL_MAX_SIZE, then moved to disk, and streamed back in chunks
+        pdf_file = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE)
+        try:
+            await asyncio.to_thread(
+                pdf_generator_service.generate_detailed_comparison_pdf_to, pdf_file, comp_data, comparison_id
+            )
+        except BaseException:
+            pdf_file.close()
+            raise
+        pdf_size = pdf_file.tell()
+        pdf_file.seek(0)
 
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"HAKEM_AI_Detailed_Technical_Comparison_{comparison_id}_{timestamp}.pdf"
 
         logger.info(
-            f"✅ Detailed Comparison PDF generated: {filename} ({len(pdf_bytes)} bytes)"
+            f"✅ Detailed Comparison PDF generated: {filename} ({pdf_size} bytes)"
         )
 
         # Return PDF as download with proper headers
-        return Response(
-            content=pdf_bytes,
+        return StreamingResponse(
+            _iter_pdf_file(pdf_file),
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f'inline; filename="{filename}"',
-                "Content-Length": str(len(pdf_bytes)),
+                "Content-Length": str(pdf_size),
                 "Content-Type": "application/pdf",
             },
         )
@@ -1179,7 +1194,6 @@ async def download_detailed_comparison_pdf(
         raise
     except Exception as e:
         logger.error(f"❌ Error generating Detailed Comparison PDF: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Failed to generate Detailed Comparison PDF: {str(e)}")
 
@@ -1476,7 +1490,6 @@ async def initialize_hakim_scores():
         
     except Exception as e:
         logger.error(f"❌ Error initializing Hakim scores: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Failed to initialize Hakim scores: {str(e)}")
 
@@ -1923,7 +1936,6 @@ async def create_activity_log(log_data: ActivityLogCreate):
         
     except Exception as e:
         logger.error(f"❌ Error creating activity log: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         # Don't fail the request if logging fails
         return JSONResponse(content={
@@ -2019,7 +2031,6 @@ async def get_activity_logs(
         raise
     except Exception as e:
         logger.error(f"❌ Error getting activity logs: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         # Return empty result instead of failing completely to prevent frontend errors
         return JSONResponse(content={
@@ -2061,7 +2072,6 @@ async def get_user_activity_logs(
         raise
     except Exception as e:
         logger.error(f"❌ Error getting user activity logs: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Failed to get user activity logs: {str(e)}")
 
@@ -2129,7 +2139,6 @@ async def get_activity_statistics(
         raise
     except Exception as e:
         logger.error(f"❌ Error getting activity statistics: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Failed to get activity statistics: {str(e)}")
 
@@ -2156,7 +2165,6 @@ async def get_recent_activity_logs(
         raise
     except Exception as e:
         logger.error(f"❌ Error getting recent activity logs: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Failed to get recent activity logs: {str(e)}")
 
@@ -1,11 +1,16 @@
+import heapq
 import logging
 import os
 import re
-import zipfile
-from typing import Dict, Any, List, Optional
+import traceback
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Dict, Any, Iterator, List, Optional, NamedTuple, Tuple
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
+from operator import attrgetter
 from pathlib import Path
+from xml.sax.saxutils import escape
 
 # Optional import for reportlab - only needed when generating PDFs
 try:
@@ -21,6 +26,12 @@ try:
     from reportlab.platypus.frames import Frame
     from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate
     from reportlab.lib.utils import ImageReader
+    
+    # Report palette, parsed once
+    _DARK_GREEN = HexColor('#2D5016')
+    _MEDIUM_GREEN = HexColor('#4A7C2A')
+    _LIGHT_GREEN = HexColor('#6B9F3D')
+    _ALT_ROW_GREY = HexColor('#F5F5F5')
     REPORTLAB_AVAILABLE = True
 except ImportError:
     REPORTLAB_AVAILABLE = False
@@ -29,13 +40,591 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Digit groups (with thousands separators) inside currency strings like "SR 1,564,652,306"
+_CURRENCY_RE = re.compile(r'[\d,]+')
+# Whitespace dropped before matching so "1 564 652 306" (incl. tabs/non-breaking spaces) stays one group
+_WS_TABLE = str.maketrans('', '', ' \t\xa0')
+# Sum insured parsing: strip everything but digits/separators, then split into numbers
+_NON_NUMERIC_RE = re.compile(r'[^\d,.]')
+_DECIMAL_NUMBER_RE = re.compile(r'[\d,]+\.?\d*')
+
+# Item text that starts with an ellipsis or an "all <category>" truncation phrase (see _is_valid_item_text_cached)
+_TRUNCATED_ITEM_RE = re.compile(r'(?:\.\.\.|…|all (?:requirements|conditions|exclusions|warranties))', re.IGNORECASE)
+
+# Rate cells like "FLAT Premium" are shown verbatim (matched without building an upper-cased copy)
+_FLAT_RATE_RE = re.compile(r'FLAT|PREMIUM', re.IGNORECASE)
+
+# Recommendation reasoning rewrites for the strategic memo (see _clean_recommendation_reasoning)
+# "and a [low/competitive] rate of X, significantly lower than Provider's SAR Y"
+_PREMIUM_COMPARISON_RE = re.compile(
+    r'\band\s+(a|an)?\s*(low|high|competitive)?\s*(rate|premium)\s+of\s+([^,]+),\s+significantly\s+(lower|higher)\s+than\s+([A-Za-z\s\']+?)\'s\s+SAR\s+([\d,]+\.?\d*)',
+    re.IGNORECASE
+)
+# "significantly lower than Provider's SAR X"
+_SIGNIFICANTLY_THAN_RE = re.compile(
+    r'\b(significantly|substantially)\s+(lower|higher)\s+than\s+([A-Za-z\s\']+?)\'s\s+SAR\s+([\d,]+\.?\d*)',
+    re.IGNORECASE
+)
+# "Provider's SAR X" (when not already "premium of")
+_POSSESSIVE_SAR_RE = re.compile(
+    r'\b([A-Za-z\s\']+?)\'s\s+(?!premium\s+of\s+SAR)SAR\s+([\d,]+\.?\d*)(?=\s|\.|,|$)',
+    re.IGNORECASE
+)
+# Sum insured / coverage limit noise, removed in one scan. The alternatives start on different
+# tokens, so a single leftmost-match pass removes what the former four sequential passes did.
+_SUM_INSURED_NOISE_RE = re.compile(
+    # Explicit sum insured and coverage limit mentions (fixed for all insurers), to the end of the sentence
+    r'\b(?:sum insured|Sum Insured|coverage limit|Coverage Limit|substantial coverage limit|total sum insured)\b[^.]*\.?'
+    # Phrases with large numbers + billion/million ("offers a high 56 billion")
+    r'|\b(?:offers?|with|of|has|provides?)\s+(?:a|an)?\s*(?:high|total|maximum)?\s*[\d,]+\.?\d*\s*(?:billion|million)\b'
+    # Standalone large numbers with billion/million (only very large numbers to avoid removing premiums)
+    r'|\b[\d,]{4,}\.?\d*\s*(?:billion|million)\b'
+    # SAR values with very large numbers (likely sum insured, not premiums), with any billion/million unit
+    r'|\b(?:SAR|SR)\s*[\d,]{9,}\b(?:\.?\d*\s*(?:billion|million)\b)?',
+    re.IGNORECASE
+)
+_DOUBLE_COMMA_RE = re.compile(r'\s*,\s*,')
+_DOUBLE_PERIOD_RE = re.compile(r'\s*\.\s*\.')
+
+# Prefix for bullet lines inside joined (<br/>) list paragraphs
+_BULLET = "• "
+
+# Bound number formatters for per-row table cells (parsed once instead of per f-string call)
+_FMT_2F = "{:,.2f}".format
+_FMT_1F = "{:.1f}".format
+_FMT_0F = "{:,.0f}".format
+_FMT_2F_PLAIN = "{:.2f}".format  # No thousands separator (scores)
+_FMT_PCT_2F = "{:.2f}%".format  # Direct % symbol
+
+
+class _ProviderRow(NamedTuple):
+    """Normalized view of a data_table row, extracted once per report."""
+    name: str
+    safe_name: str  # XML-escaped name, ready for Paragraph markup
+    score: float
+    premium: float
+    benefits_count: int
+    benefits: Any
+    rate: Any
+    rank: Any
+
+
+# Sort keys for the detailed analysis tables; the numeric fields were coerced once in _normalize_rows
+_BY_SCORE = attrgetter("score")
+_BY_PREMIUM = attrgetter("premium")
+
+
+class _RankItem(NamedTuple):
+    """Fields of a summary ranking entry, read once per section."""
+    company: Any
+    score: Any
+    premium: Any
+    rate: Any
+    rank: Any  # None when the entry has no rank
+
+
+class _ComparisonView(NamedTuple):
+    """Sanitized top-level sections of the comparison data, parsed once per report."""
+    summary: Dict[str, Any]
+    ranking: List[Dict[str, Any]]  # summary["ranking"], dict entries only
+    key_differences: Dict[str, Any]
+    data_table: Dict[str, Any]
+    rows: List[Any]  # data_table["rows"], dict or list entries only
+    row_dicts: List[Dict[str, Any]]  # the dict entries of rows
+    side_by_side: Dict[str, Any]
+    providers: List[Any]  # side_by_side["providers"]
+    analytics: Dict[str, Any]
+    extracted_quotes: List[Any]
+    generated_at: datetime  # Report timestamp shared by the cover page and memo
+
+
+def _require_reportlab() -> None:
+    """Raise ImportError when ReportLab is missing, before any report is rendered."""
+    if not REPORTLAB_AVAILABLE:
+        raise ImportError(
+            "ReportLab is not installed. Please install it with: pip install reportlab==4.2.5"
+        )
+
+
+def _entries_of(items: List[Any], kinds: Any) -> List[Any]:
+    """
+    Return items if every entry is an instance of kinds, otherwise a copy without the other entries.
+    
+    Well-formed lists from the comparison pipeline are returned as-is after one scan, without being
+    copied; only malformed input pays for the filtered copy.
+    """
+    for item in items:
+        if not isinstance(item, kinds):
+            return [entry for entry in items if isinstance(entry, kinds)]
+    return items
+
+
+def _as_text(item: Any) -> str:
+    """Display text of a benefit/exclusion/subjectivity entry (plain string or {"text": ...} dict)."""
+    # Identity check first: nearly every item is a plain str
+    if item.__class__ is str:
+        return item
+    if isinstance(item, dict):
+        return item.get("text", str(item))
+    return str(item)
+
+
+def _benefits_count(row: Dict[str, Any]) -> int:
+    """Benefits count of a data_table row: the length of its benefits list, else its numeric benefits/benefits_count field."""
+    benefits_val = row.get("benefits")
+    if isinstance(benefits_val, list):
+        # An empty list is a real count of 0
+        return len(benefits_val)
+    count = benefits_val or row.get("benefits_count")
+    return int(count) if count else 0
+
+
+def _digit_count(number_text: str) -> int:
+    """Number of digits in a matched number string (its length without separators)."""
+    return len(number_text) - number_text.count(",") - number_text.count(".")
+
+
+def _extract_sum_insured_numeric(value: Any) -> float:
+    """Extract numeric sum insured value from various formats."""
+    if not value:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        # Remove common prefixes and extract numbers
+        cleaned = _NON_NUMERIC_RE.sub('', value.replace(" ", ""))
+        numbers = _DECIMAL_NUMBER_RE.findall(cleaned)
+        if numbers:
+            # Get the largest number (sum insured is usually the largest value)
+            largest_num = max(numbers, key=_digit_count)
+            try:
+                return float(largest_num.replace(",", ""))
+            except (ValueError, AttributeError):
+                return 0.0
+    return 0.0
+
+
+@lru_cache(maxsize=4096)
+def _is_valid_item_text_cached(text_str: str) -> bool:
+    """Check a stripped item string for truncation markers (see PDFGeneratorService._is_valid_item_text)."""
+    # Skip if too short (likely incomplete)
+    n = len(text_str)
+    if n < 5:
+        return False
+    
+    # CRITICAL FIX: Skip truncated items - leading ellipsis or an "all <category>" truncation phrase
+    # (only text starting with '.', '…' or 'a' can match, so check the first character before the regex)
+    if text_str[0] in '.…aA' and _TRUNCATED_ITEM_RE.match(text_str):
+        return False
+    
+    # If text is very short and contains ellipsis, skip it
+    if n < 30 and '...' in text_str:
+        return False
+    
+    return True
+
+
+def _fix_premium_comparison(match: "re.Match") -> str:
+    """Rewrite "and a low rate of X, significantly lower than P's SAR Y" as "with low rate of X, compared to P's premium of SAR Y"."""
+    rate_adj = match.group(2) + ' ' if match.group(2) else ''
+    rate_type = match.group(3)
+    rate_val = match.group(4)
+    provider = match.group(6)
+    premium_val = match.group(7)
+    return f"with {rate_adj}{rate_type} of {rate_val}, compared to {provider}'s premium of SAR {premium_val}"
+
+
+def _clean_recommendation_reasoning(text: str) -> str:
+    """Clarify premium comparisons and drop sum insured / coverage limit mentions from AI reasoning text."""
+    # All three premium rewrites need a possessive "'s", so text without an apostrophe skips them
+    if "'" in text:
+        # CRITICAL FIX: Clarify premium comparisons - fix confusing sentence structure
+        text = _PREMIUM_COMPARISON_RE.sub(_fix_premium_comparison, text)
+        # More general fix: "significantly lower than Provider's SAR X" -> "compared to Provider's premium of SAR X"
+        text = _SIGNIFICANTLY_THAN_RE.sub(r'compared to \3\'s premium of SAR \4', text)
+        # Fix: "Provider's SAR X" -> "Provider's premium of SAR X" (when not already "premium of")
+        # The three rewrites stay separate passes: the lazy provider match can start at an earlier word
+        # than the "significantly lower than" rewrite, so one alternation would pick the wrong rewrite
+        text = _POSSESSIVE_SAR_RE.sub(r'\1\'s premium of SAR \2', text)
+    
+    # Remove sum insured / coverage limit mentions and very large amounts in one pass
+    text = _SUM_INSURED_NOISE_RE.sub('', text)
+    # Clean up whitespace and punctuation. Once whitespace runs are single spaces, the double
+    # comma/period patterns can only match where these substrings occur, so usually no regex runs.
+    text = ' '.join(text.split())
+    if ',,' in text or ', ,' in text:
+        text = _DOUBLE_COMMA_RE.sub(',', text)  # Remove double commas
+    if '..' in text or '. .' in text:
+        text = _DOUBLE_PERIOD_RE.sub('.', text)  # Remove double periods
+    return text
+
+
+def _format_ui_table_cell_value(column_key: str, value: Any) -> str:
+    """Format a table cell value to match UI exactly (see PDFGeneratorService._format_ui_table_cell)."""
+    if value is None:
+        return "N/A"
+    
+    # Provider name - return as-is (string)
+    if column_key == "provider_name":
+        return str(value) if value else "N/A"
+    
+    # Score - format as decimal with 1 decimal place and % sign (UI shows "77.0%")
+    elif column_key == "score":
+        try:
+            score_val = float(value) if value else 0
+            return f"{score_val:.1f}%"  # Direct % symbol
+        except (ValueError, TypeError):
+            return "0.0%"
+    
+    # Premium - format as number without SAR prefix (UI shows just numbers with commas)
+    elif column_key == "premium":
+        try:
+            premium_val = float(value) if value else 0
+            # Format with commas, no decimal places (UI shows integers)
+            return _FMT_0F(premium_val)
+        except (ValueError, TypeError):
+            return "0"
+    
+    # Rate - format as percentage or per mille (handle FLAT Premium case)
+    elif column_key == "rate":
+        if isinstance(value, str):
+            # If it already has % or ‰, return as-is (cheapest check first)
+            if '%' in value or '‰' in value:
+                return value
+            # CRITICAL FIX: Handle "FLAT Premium" case - don't add % sign
+            if _FLAT_RATE_RE.search(value):
+                return value  # Return as-is for FLAT Premium
+            # Try to parse as number if it's a numeric string
+            try:
+                rate_val = float(value.replace('%', '').replace('‰', '').strip())
+                if rate_val < 1:
+                    return f"{rate_val:.2f}\u2030"  # Unicode for ‰
+                else:
+                    return f"{rate_val:.2f}%"  # Direct % symbol
+            except:
+                return value  # Return original if can't parse
+        try:
+            rate_val = float(value) if value else 0
+            if rate_val < 1:
+                return f"{rate_val:.2f}\u2030"  # Unicode for ‰
+            else:
+                return f"{rate_val:.2f}%"  # Direct % symbol
+        except (ValueError, TypeError):
+            return "N/A"
+    
+    # Coverage - format as number with commas
+    elif column_key == "coverage":
+        try:
+            # If it's already a string with formatting, return as-is
+            if isinstance(value, str):
+                return value
+            coverage_val = float(value) if value else 0
+            return _FMT_0F(coverage_val)
+        except (ValueError, TypeError):
+            return "0"
+    
+    # Benefits, Exclusions, Warranties - show count only (integer)
+    elif column_key in ["benefits", "exclusions", "warranties"]:
+        try:
+            count_val = int(value) if value else 0
+            return str(count_val)
+        except (ValueError, TypeError):
+            return "0"
+    
+    # Rank - show integer
+    elif column_key == "rank":
+        try:
+            rank_val = int(value) if value else 0
+            return str(rank_val)
+        except (ValueError, TypeError):
+            return "0"
+    
+    # Default - return as string
+    return str(value) if value else "N/A"
+
+
+# Memoized for str/int/float cells, which repeat across rows ("N/A" rates, zero counts, FLAT Premium)
+_format_ui_table_cell_cached = lru_cache(maxsize=1024, typed=True)(_format_ui_table_cell_value)
+
+
+def _format_or_default(value: Any, formatter: Callable[[float], str], default: str) -> str:
+    """Format a (possibly string) number with a bound formatter, or return default for empty/zero values."""
+    return formatter(float(value)) if value else default
+
+
+def _format_rate_value(value: Any) -> str:
+    """Format a numeric rate: per mille for fractional floats, percent otherwise."""
+    if isinstance(value, float) and value < 1:
+        return f"{value:.2f}\u2030"  # Unicode for ‰
+    return f"{value:.2f}%"  # Direct % symbol
+
+
+@lru_cache(maxsize=64)
+def _formatter_for_column(column_name: Any) -> Callable[[Any], str]:
+    """Pick the cell formatter for a generic table column once, by its name."""
+    col_lower = str(column_name).lower()
+    
+    # Format numbers
+    if 'premium' in col_lower:
+        format_number = "SAR {:,.2f}".format
+    elif 'coverage' in col_lower:
+        format_number = _FMT_0F
+    elif 'rate' in col_lower:
+        format_number = _format_rate_value
+    elif 'score' in col_lower:
+        format_number = _FMT_1F
+    else:
+        format_number = _FMT_0F
+    
+    def format_cell(value: Any) -> str:
+        if value is None:
+            return "N/A"
+        if isinstance(value, (int, float)):
+            return format_number(value)
+        # CRITICAL FIX: Return full string WITHOUT truncation
+        # ReportLab Paragraph will handle text wrapping automatically
+        return str(value)
+    
+    return format_cell
+
+
+@lru_cache(maxsize=1)
+def _get_stylesheet():
+    """
+    Return the report stylesheet, built on first use and shared by every service instance.
+    
+    Worker processes forked from a parent that already built it reuse the same style objects.
+    The custom names never clash with the sample stylesheet, so they are added unconditionally.
+    """
+    styles = getSampleStyleSheet()
+    
+    # Title style - REDUCED SPACING
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=20,  # Reduced from 24
+        textColor=_DARK_GREEN,
+        spaceAfter=15,  # Reduced from 30
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+    
+    # Section heading - REDUCED SPACING
+    styles.add(ParagraphStyle(
+        name='SectionHeading',
+        parent=styles['Heading2'],
+        fontSize=14,  # Reduced from 16
+        textColor=_MEDIUM_GREEN,
+        spaceAfter=8,  # Reduced from 12
+        spaceBefore=12,  # Reduced from 20
+        fontName='Helvetica-Bold'
+    ))
+    
+    # Subsection heading - REDUCED SPACING
+    styles.add(ParagraphStyle(
+        name='SubsectionHeading',
+        parent=styles['Heading3'],
+        fontSize=12,  # Reduced from 14
+        textColor=_LIGHT_GREEN,
+        spaceAfter=6,  # Reduced from 8
+        spaceBefore=8,  # Reduced from 12
+        fontName='Helvetica-Bold'
+    ))
+    
+    # Custom body text (use different name to avoid conflict)
+    styles.add(ParagraphStyle(
+        name='CustomBodyText',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.black,
+        spaceAfter=6,
+        alignment=TA_LEFT
+    ))
+    
+    # Highlighted text
+    styles.add(ParagraphStyle(
+        name='Highlight',
+        parent=styles['Normal'],
+        fontSize=11,
+        textColor=_DARK_GREEN,
+        fontName='Helvetica-Bold'
+    ))
+    
+    # Company name style
+    styles.add(ParagraphStyle(
+        name='CompanyName',
+        parent=styles['Normal'],
+        fontSize=12,
+        textColor=_DARK_GREEN,
+        fontName='Helvetica-Bold',
+        spaceAfter=4
+    ))
+    
+    # Cover page "Generated on" line
+    styles.add(ParagraphStyle(
+        name='CoverDate',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.grey,
+        alignment=TA_CENTER,
+        spaceAfter=12
+    ))
+    
+    # Strategic memo TO/DATE/SUBJECT header
+    styles.add(ParagraphStyle(
+        name='MemoInfo',
+        parent=styles['Normal'],
+        fontSize=9,
+        leading=15,  # Line pitch of the former one-paragraph-per-line layout (12pt + 3pt spaceAfter)
+        textColor=colors.black,
+        spaceAfter=3,
+        leftIndent=0.3*inch
+    ))
+    
+    # Strategic memo key decision factors
+    styles.add(ParagraphStyle(
+        name='CompactFactors',
+        parent=styles['CustomBodyText'],
+        fontSize=9,
+        leading=15,
+        spaceAfter=3
+    ))
+    
+    # Strategic memo closing tagline
+    styles.add(ParagraphStyle(
+        name='HakemTagline',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=_MEDIUM_GREEN,
+        alignment=TA_CENTER,
+        spaceAfter=12,
+        fontName='Helvetica-Bold'
+    ))
+    
+    # Detailed analysis "Technical Recommendation" one-liners
+    styles.add(ParagraphStyle(
+        name='TechRec',
+        parent=styles['CustomBodyText'],
+        fontSize=9,
+        textColor=_DARK_GREEN,
+        leftIndent=0.2*inch,
+        spaceAfter=6
+    ))
+    
+    # Detailed analysis limited-benefits footnote
+    styles.add(ParagraphStyle(
+        name='BenefitsNote',
+        parent=styles['CustomBodyText'],
+        fontSize=8,
+        textColor=colors.grey,
+        spaceAfter=6,
+        leftIndent=0.2*inch
+    ))
+    
+    # Detailed analysis per-provider benefits list
+    styles.add(ParagraphStyle(
+        name='BenefitsText',
+        parent=styles['CustomBodyText'],
+        fontSize=8,
+        spaceAfter=3,
+        leftIndent=0.2*inch,
+        bulletIndent=0.2*inch
+    ))
+    
+    # Detailed analysis per-provider benefits total
+    styles.add(ParagraphStyle(
+        name='TotalBenefits',
+        parent=styles['CustomBodyText'],
+        fontSize=7,
+        textColor=colors.grey,
+        leftIndent=0.2*inch,
+        spaceBefore=4
+    ))
+    
+    # Detailed analysis line of business / sum insured banner
+    styles.add(ParagraphStyle(
+        name='IntroInfo',
+        parent=styles['Normal'],
+        fontSize=11,
+        textColor=_DARK_GREEN,
+        spaceAfter=8,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+    
+    # Subjectivities matrix header cells
+    styles.add(ParagraphStyle(
+        name='SubjHeader',
+        parent=styles['CustomBodyText'],
+        fontSize=8,
+        fontName='Helvetica-Bold',
+        wordWrap='LTR',
+        leading=10
+    ))
+    
+    # Subjectivities matrix text cells
+    styles.add(ParagraphStyle(
+        name='SubjCell',
+        parent=styles['CustomBodyText'],
+        fontSize=7,
+        wordWrap='LTR',
+        leading=9,
+        leftIndent=0,
+        rightIndent=0
+    ))
+    
+    # Subjectivities matrix check marks
+    styles.add(ParagraphStyle(
+        name='SubjCheck',
+        parent=styles['CustomBodyText'],
+        fontSize=9,
+        alignment=TA_CENTER
+    ))
+    
+    # Detailed analysis final recommendation
+    styles.add(ParagraphStyle(
+        name='FinalRecommendation',
+        parent=styles['CustomBodyText'],
+        fontSize=10,
+        textColor=_DARK_GREEN,
+        spaceAfter=8,
+        alignment=TA_JUSTIFY,
+        leftIndent=0.2*inch,
+        rightIndent=0.2*inch
+    ))
+    
+    return styles
+
+
+
+@lru_cache(maxsize=1)
+def _resolved_logo_path() -> Optional[str]:
+    """Return the first existing logo file among the common locations, or None."""
+    possible_paths = [
+        "logo.png",
+        "logo.jpg",
+        "assets/logo.png",
+        "static/logo.png",
+        "app/static/logo.png",
+        "hakem_logo.png",
+        "hakem-ai-logo.png"
+    ]
+    
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+    
+    return None
+
 
 class BorderedDocTemplate(BaseDocTemplate):
     """Custom document template with decorative borders on all pages."""
     
+    _BORDER_FORM = 'PageBorder'
+    
     def __init__(self, *args, **kwargs):
         BaseDocTemplate.__init__(self, *args, **kwargs)
-        self.border_color = HexColor('#2D5016')  # Dark green
+        self.border_color = _DARK_GREEN
         self.border_width = 2
         
         # Create a default page template with frame
@@ -52,27 +641,34 @@ class BorderedDocTemplate(BaseDocTemplate):
         self.addPageTemplates([template])
     
     def _on_page(self, canvas, doc):
-        """Called for each page - we'll draw borders in afterPage instead."""
-        pass
-        
-    def afterPage(self):
-        """Draw borders and page numbers after each page is created."""
-        self.canv.saveState()
+        """
+        Define the page border as a form XObject before the first page is drawn.
         
-        # Draw full page borders
-        border_width = self.border_width
+        The border is identical on every page, so it is written to the PDF once and afterPage
+        only references it.
+        """
+        if canvas.hasForm(self._BORDER_FORM):
+            return
         margin = 0.5 * inch
-        
-        self.canv.setStrokeColor(self.border_color)
-        self.canv.setLineWidth(border_width)
-        
-        # Draw full rectangle border around the page
-        self.canv.rect(
+        canvas.beginForm(self._BORDER_FORM)
+        canvas.setStrokeColor(self.border_color)
+        canvas.setLineWidth(self.border_width)
+        # Full rectangle border around the page
+        canvas.rect(
             margin,
             margin,
             self.pagesize[0] - 2 * margin,
             self.pagesize[1] - 2 * margin
         )
+        canvas.endForm()
+        
+    def afterPage(self):
+        """Draw borders and page numbers after each page is created."""
+        self.canv.saveState()
+        
+        # Draw full page borders
+        self.canv.doForm(self._BORDER_FORM)
+        margin = 0.5 * inch
         
         # Draw page number at the bottom center (skip first page - cover page)
         page_number = self.canv.getPageNumber()
@@ -99,6 +695,19 @@ class PDFGeneratorService:
     - Comprehensive error handling and validation
     """
     
+    # data_table row keys per UI column, in lookup priority order
+    _DATA_TABLE_KEYS = {
+        "provider_name": ("provider_name", "provider", "company", "company_name"),
+        "score": ("score", "weighted_score"),
+        "premium": ("premium", "premium_amount"),
+        "rate": ("rate",),
+        "coverage": ("coverage", "coverage_limit"),
+        "rank": ("rank", "ranking"),
+    }
+    
+    # Cover page logo file contents, read on first use (see _create_logo_element)
+    _logo_bytes: Optional[bytes] = None
+    
     def __init__(self):
         """Initialize PDF generator service."""
         if not REPORTLAB_AVAILABLE:
@@ -108,301 +717,430 @@ class PDFGeneratorService:
             return
         
         self.page_width, self.page_height = letter
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        self.styles = _get_stylesheet()
+        self._setup_layout()
+        self._setup_table_styles()
+        self._setup_cached_styles()
+        self._setup_cell_extractors()
+        self._body_style = self.styles['CustomBodyText']
         logger.info("✅ PDF Generator Service initialized (Enhanced Version)")
     
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles for professional formatting."""
-        if not REPORTLAB_AVAILABLE or self.styles is None:
-            return
+    def _setup_layout(self):
+        """Precompute the content width and fixed column widths for the page size."""
+        # Page size and margins shared by every report
+        self._doc_kwargs = {
+            "pagesize": letter,
+            "rightMargin": 0.75*inch,
+            "leftMargin": 0.75*inch,
+            "topMargin": 1*inch,
+            "bottomMargin": 0.75*inch,
+            # Pinned rather than left to rl_config (which site settings can override): zlib-compressed
+            # page streams and no invariant/reproducible-output bookkeeping
+            "pageCompression": 1,
+            "invariant": 0,
+        }
+        self._content_width = self.page_width - 1.5*inch  # Conservative margins
+        width = self._content_width
+        # Price Differences table: provider, provider, difference, difference %
+        self._diff_col_widths = (width * 0.3, width * 0.3, width * 0.2, width * 0.2)
+        # Detailed Data Table: UI column proportions
+        self._data_col_widths = (
+            width * 0.20,  # Provider name (20%) - will wrap if needed
+            width * 0.10,  # Score (10%)
+            width * 0.12,  # Premium (12%)
+            width * 0.10,  # Rate (10%)
+            width * 0.15,  # Coverage (15%)
+            width * 0.08,  # Benefits (8%)
+            width * 0.08,  # Exclusions (8%)
+            width * 0.08,  # Warranties (8%)
+            width * 0.09,  # Rank (9%)
+        )
         
-        # Helper function to add style only if it doesn't exist
-        def add_style_if_not_exists(name, style_obj):
-            if name not in self.styles.byName:
-                self.styles.add(style_obj)
-        
-        # Title style - REDUCED SPACING
-        add_style_if_not_exists('CustomTitle', ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=20,  # Reduced from 24
-            textColor=HexColor('#2D5016'),  # Dark green
-            spaceAfter=15,  # Reduced from 30
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        ))
+        # Side-by-side and analytics tables use slightly wider margins
+        narrow = self.page_width - 1.8*inch
+        self._provider_col_widths = (narrow * 0.4, narrow * 0.2, narrow * 0.25, narrow * 0.15)
+        self._premium_col_widths = (narrow * 0.5, narrow * 0.5)
+        self._score_col_widths = (narrow * 0.5, narrow * 0.3, narrow * 0.2)
+    
+    def _new_doc(self, sink: BinaryIO) -> BorderedDocTemplate:
+        """Create a bordered document writing to sink with the standard report page setup."""
+        return BorderedDocTemplate(sink, **self._doc_kwargs)
+    
+    def _setup_table_styles(self):
+        """Build the static table styles shared by the detailed analysis tables once."""
+        base_cmds = (
+            ('BACKGROUND', (0, 0), (-1, 0), _MEDIUM_GREEN),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, _ALT_ROW_GREY]),
+        )
         
-        # Section heading - REDUCED SPACING
-        add_style_if_not_exists('SectionHeading', ParagraphStyle(
-            name='SectionHeading',
-            parent=self.styles['Heading2'],
-            fontSize=14,  # Reduced from 16
-            textColor=HexColor('#4A7C2A'),  # Medium green
-            spaceAfter=8,  # Reduced from 12
-            spaceBefore=12,  # Reduced from 20
-            fontName='Helvetica-Bold'
-        ))
+        # Coverage, Hakim score and premium tables wrap provider names; the statistics table does not
+        self._stats_table_style = TableStyle(base_cmds)
+        self._detail_table_style = TableStyle(
+            base_cmds[:5] + (('WORDWRAP', (0, 0), (-1, -1), True),) + base_cmds[5:]
+        )
         
-        # Subsection heading - REDUCED SPACING
-        add_style_if_not_exists('SubsectionHeading', ParagraphStyle(
-            name='SubsectionHeading',
-            parent=self.styles['Heading3'],
-            fontSize=12,  # Reduced from 14
-            textColor=HexColor('#6B9F3D'),  # Light green
-            spaceAfter=6,  # Reduced from 8
-            spaceBefore=8,  # Reduced from 12
-            fontName='Helvetica-Bold'
-        ))
+        # Key differences price table; ROWBACKGROUNDS only applies with more than one data row
+        diff_cmds = (
+            ('BACKGROUND', (0, 0), (-1, 0), _MEDIUM_GREEN),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (1, -1), 'LEFT'),  # Provider columns left-aligned
+            ('ALIGN', (2, 0), (-1, -1), 'CENTER'),  # Price/% columns center
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # CRITICAL FIX: TOP alignment prevents overlap
+            ('WORDWRAP', (0, 0), (-1, -1), True),  # CRITICAL FIX: Enable word wrap
+            # FONTNAME and FONTSIZE removed for header since it's now in Paragraph style
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),  # Increased padding for header
+            ('TOPPADDING', (0, 0), (-1, 0), 8),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 7),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),  # Padding for data rows
+            ('TOPPADDING', (0, 1), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('LEFTPADDING', (0, 0), (-1, -1), 4),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+        )
         
-        # Custom body text (use different name to avoid conflict)
-        add_style_if_not_exists('CustomBodyText', ParagraphStyle(
-            name='CustomBodyText',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            textColor=colors.black,
-            spaceAfter=6,
-            alignment=TA_LEFT
-        ))
+        # Data table section - EXACT UI COLORS AND STYLING WITH ENHANCED VERTICAL SPACING
+        data_cmds = (
+            # Header row - Dark green background (#4A7C2A) with WHITE text
+            ('BACKGROUND', (0, 0), (-1, 0), _MEDIUM_GREEN),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),  # WHITE, not whitesmoke
+            # FONTNAME and FONTSIZE removed here since headers are now Paragraphs with their own style
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),  # Increased padding for header
+            ('TOPPADDING', (0, 0), (-1, 0), 10),  # Increased padding for header
+            
+            # Alignment: Provider name LEFT, others CENTER
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),  # Provider name left-aligned
+            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),  # All other columns center-aligned
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # CRITICAL FIX: TOP alignment prevents overlap
+            
+            # CRITICAL FIX: Enable word wrap for all cells
+            ('WORDWRAP', (0, 0), (-1, -1), True),
+            
+            # Data rows - White and light grey alternating
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),  # Default white
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),  # Smaller font for data (8pt instead of 9pt)
+            
+            # Grid lines
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            
+            # CRITICAL FIX: Increased vertical padding to prevent overlap
+            ('LEFTPADDING', (0, 0), (-1, -1), 4),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+            ('TOPPADDING', (0, 1), (-1, -1), 10),  # Increased from 6 to 10
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 10),  # Increased from 6 to 10
+        )
         
-        # Highlighted text
-        add_style_if_not_exists('Highlight', ParagraphStyle(
-            name='Highlight',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            textColor=HexColor('#2D5016'),
-            fontName='Helvetica-Bold'
-        ))
+        row_backgrounds = ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, _ALT_ROW_GREY])
+        # Indexed by "has more than one data row"
+        self._diff_table_styles = (TableStyle(diff_cmds), TableStyle(diff_cmds + (row_backgrounds,)))
+        self._data_table_styles = (TableStyle(data_cmds), TableStyle(data_cmds + (row_backgrounds,)))
         
-        # Company name style
-        add_style_if_not_exists('CompanyName', ParagraphStyle(
-            name='CompanyName',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            textColor=HexColor('#2D5016'),
-            fontName='Helvetica-Bold',
-            spaceAfter=4
+        # Side-by-side providers table
+        provider_cmds = (
+            ('BACKGROUND', (0, 0), (-1, 0), _MEDIUM_GREEN),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),  # Provider name left-aligned
+            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),  # Other columns center
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('WORDWRAP', (0, 0), (-1, -1), True),  # CRITICAL FIX: Enable word wrap
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('TOPPADDING', (0, 0), (-1, 0), 8),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        )
+        self._provider_table_styles = (TableStyle(provider_cmds), TableStyle(provider_cmds + (row_backgrounds,)))
+        
+        # Comparison matrix premium table and analytics score table share the lighter green header
+        matrix_cmds = (
+            ('BACKGROUND', (0, 0), (-1, 0), _LIGHT_GREEN),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),  # Provider column left
+            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),  # Other columns center
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('WORDWRAP', (0, 0), (-1, -1), True),  # CRITICAL FIX: Enable word wrap
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        )
+        self._premium_table_style = TableStyle(matrix_cmds + (
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
         ))
+        self._score_table_styles = (TableStyle(matrix_cmds), TableStyle(matrix_cmds + (row_backgrounds,)))
+        
+        # Executive summary rankings table
+        ranking_cmds = (
+            ('BACKGROUND', (0, 0), (-1, 0), _MEDIUM_GREEN),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),  # Provider name left-aligned
+            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),  # Other columns center
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('WORDWRAP', (0, 0), (-1, -1), True),  # CRITICAL FIX: Enable word wrap
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+            ('TOPPADDING', (0, 0), (-1, 0), 10),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        )
+        self._ranking_table_styles = (TableStyle(ranking_cmds), TableStyle(ranking_cmds + (row_backgrounds,)))
+    
+    def _setup_cached_styles(self):
+        """Build the cell paragraph styles used by the key differences, data table and side-by-side sections once."""
+        body = self.styles['CustomBodyText']
+        self._styles_cache = {
+            # Price difference table (key differences section)
+            'price_diff_header': ParagraphStyle(
+                'PriceDiffHeader',
+                parent=body,
+                fontSize=8,
+                leading=10,
+                textColor=colors.whitesmoke,
+                fontName='Helvetica-Bold',
+                alignment=0,  # Left alignment
+                wordWrap='LTR',
+                splitLongWords=True
+            ),
+            'price_diff_body': ParagraphStyle(
+                'PriceDiffBody',
+                parent=body,
+                fontSize=7,
+                leading=9,
+                alignment=0,  # Left alignment
+                wordWrap='LTR',
+                splitLongWords=True
+            ),
+            # Data table section
+            'table_header': ParagraphStyle(
+                'TableHeader',
+                parent=body,
+                fontSize=8,
+                leading=10,
+                alignment=1,  # Center alignment
+                textColor=colors.white,
+                fontName='Helvetica-Bold',
+                wordWrap='LTR'
+            ),
+            'table_cell': ParagraphStyle(
+                'TableCell',
+                parent=body,
+                fontSize=8,
+                leading=10,  # Line height
+                alignment=0,  # Left alignment
+                wordWrap='LTR',
+                splitLongWords=True
+            ),
+            # Side-by-side providers table names: the table's 8pt Helvetica body font
+            'provider_name': ParagraphStyle(
+                'ProviderName',
+                parent=body,
+                fontSize=8,
+                leading=10
+            ),
+        }
     
     def _get_logo_path(self) -> Optional[str]:
-        """Get logo file path if available."""
-        # Try common logo locations
-        possible_paths = [
-            "logo.png",
-            "logo.jpg",
-            "assets/logo.png",
-            "static/logo.png",
-            "app/static/logo.png",
-            "hakem_logo.png",
-            "hakem-ai-logo.png"
-        ]
-        
-        for path in possible_paths:
-            if os.path.exists(path):
-                return path
-        
-        return None
+        """Get logo file path if available (resolved once per process)."""
+        return _resolved_logo_path()
     
     def _create_logo_element(self, width: float = 1.5*inch) -> Optional[Image]:
         """Create logo image element or text placeholder."""
         logo_path = self._get_logo_path()
         
-        if logo_path and os.path.exists(logo_path):
+        if logo_path:
             try:
-                img = Image(logo_path, width=width, height=width, kind='proportional')
+                # The file is read once; each cover page gets its own flowable over the cached bytes
+                if self._logo_bytes is None:
+                    self._logo_bytes = Path(logo_path).read_bytes()
+                img = Image(BytesIO(self._logo_bytes), width=width, height=width, kind='proportional')
                 return img
             except Exception as e:
-                logger.warning(f"⚠️  Could not load logo image: {e}")
+                logger.warning("⚠️  Could not load logo image: %s", e)
         
         # Return None if no logo - we'll use text instead
         return None
     
-    def _validate_comparison_data(self, comparison_data: Dict[str, Any]) -> None:
-        """Validate and sanitize comparison data structure."""
+    def _validate_comparison_data(self, comparison_data: Dict[str, Any]) -> _ComparisonView:
+        """
+        Validate the comparison data structure and return its sanitized sections.
+        
+        Missing or malformed sections become empty containers, ranking entries that are not
+        dicts and table rows that are not dicts or lists are dropped. The caller's dict is not
+        modified.
+        """
         if not isinstance(comparison_data, dict):
             logger.warning("⚠️  comparison_data is not a dict, converting...")
             comparison_data = {}
         
-        # Ensure all expected keys exist with safe defaults
-        if "summary" not in comparison_data:
-            comparison_data["summary"] = {}
-        if "key_differences" not in comparison_data:
-            comparison_data["key_differences"] = {}
-        if "data_table" not in comparison_data:
-            comparison_data["data_table"] = {}
-        if "side_by_side" not in comparison_data:
-            comparison_data["side_by_side"] = {}
-        if "analytics" not in comparison_data:
-            comparison_data["analytics"] = {}
-        
-        # Validate summary structure
-        summary = comparison_data.get("summary", {})
-        if not isinstance(summary, dict):
-            comparison_data["summary"] = {}
-        else:
-            ranking = summary.get("ranking", [])
-            if not isinstance(ranking, list):
-                summary["ranking"] = []
-            else:
-                # Ensure all ranking items are dicts
-                summary["ranking"] = [item for item in ranking if isinstance(item, dict)]
+        def section(container: Dict[str, Any], key: str, kind: type) -> Any:
+            value = container.get(key)
+            return value if isinstance(value, kind) else kind()
+        
+        summary = section(comparison_data, "summary", dict)
+        data_table = section(comparison_data, "data_table", dict)
+        side_by_side = section(comparison_data, "side_by_side", dict)
+        rows = _entries_of(section(data_table, "rows", list), (dict, list))
+        view = _ComparisonView(
+            summary=summary,
+            ranking=_entries_of(section(summary, "ranking", list), dict),
+            key_differences=section(comparison_data, "key_differences", dict),
+            data_table=data_table,
+            rows=rows,
+            row_dicts=_entries_of(rows, dict),
+            side_by_side=side_by_side,
+            providers=section(side_by_side, "providers", list),
+            analytics=section(comparison_data, "analytics", dict),
+            extracted_quotes=section(comparison_data, "extracted_quotes", list),
+            generated_at=datetime.now(),
+        )
         
-        # Validate data_table structure
-        data_table = comparison_data.get("data_table", {})
-        if not isinstance(data_table, dict):
-            comparison_data["data_table"] = {}
-        else:
-            rows = data_table.get("rows", [])
-            if not isinstance(rows, list):
-                data_table["rows"] = []
-            else:
-                # Ensure all rows are dicts or lists
-                data_table["rows"] = [row for row in rows if isinstance(row, (dict, list))]
-            
-            columns = data_table.get("columns", [])
-            if not isinstance(columns, list):
-                data_table["columns"] = []
+        logger.info("✅ Comparison data validated: summary=%s, data_table=%s, side_by_side=%s",
+                    bool(summary), bool(data_table), bool(side_by_side))
+        return view
+    
+    @contextmanager
+    def _safe_section(self, name: str, story: List, fallback: Optional[Callable[[], List]] = None) -> Iterator[List]:
+        """
+        Build one report section into a scratch list and add it to story only if it completes.
         
-        logger.info(f"✅ Comparison data validated: summary={bool(comparison_data.get('summary'))}, "
-                   f"data_table={bool(comparison_data.get('data_table'))}, "
-                   f"side_by_side={bool(comparison_data.get('side_by_side'))}")
+        A failing section is logged with its traceback and replaced by the flowables fallback()
+        returns (if given), so a half-built section never reaches the document and the rest of
+        the report still renders. fallback is only called on failure.
+        """
+        section: List = []
+        logger.info("📄 Building %s...", name)
+        try:
+            yield section
+        except Exception as e:
+            logger.error("❌ Error building %s: %s", name, e)
+            logger.error(traceback.format_exc())
+            if fallback is not None:
+                story.extend(fallback())
+        else:
+            story.extend(section)
+            logger.info("✅ Built %s", name)
+    
+    def _fallback_cover(self, page_break: bool) -> List:
+        """Plain title page used when the cover page cannot be built."""
+        cover = [Paragraph("Insurance Quote Comparison Report", self.styles['CustomTitle'])]
+        if page_break:
+            cover.append(PageBreak())
+        return cover
+    
+    def _fallback_memo(self) -> List:
+        """Placeholder used when the strategic memo cannot be built, so the PDF still generates."""
+        return [
+            Paragraph("Strategic Analysis", self.styles['SectionHeading']),
+            Paragraph("An error occurred while generating the strategic memo. Please refer to the detailed comparison report.", self.styles['CustomBodyText']),
+        ]
     
     def generate_comparison_pdf(
         self,
         comparison_data: Dict[str, Any],
         comparison_id: str
     ) -> BytesIO:
+        """Generate the comprehensive PDF report into a BytesIO buffer (see generate_comparison_pdf_to)."""
+        buffer = BytesIO()
+        self.generate_comparison_pdf_to(buffer, comparison_data, comparison_id)
+        buffer.seek(0)
+        return buffer
+    
+    def generate_comparison_pdf_to(
+        self,
+        sink: BinaryIO,
+        comparison_data: Dict[str, Any],
+        comparison_id: str
+    ) -> None:
         """
-        Generate comprehensive PDF report from comparison data.
+        Render comprehensive PDF report from comparison data into sink.
         
         ✨ ENHANCED with Strategic Memo and Detailed Analysis sections
         
         Args:
+            sink: Writable binary stream the PDF is written to
             comparison_data: Complete comparison data from API
             comparison_id: Comparison ID for filename
             
-        Returns:
-            BytesIO buffer containing PDF bytes
-            
         Raises:
             ImportError: If reportlab is not installed
         """
-        if not REPORTLAB_AVAILABLE:
-            raise ImportError(
-                "ReportLab is not installed. Please install it with: pip install reportlab==4.2.5"
-            )
+        _require_reportlab()
         
         try:
             # Validate and sanitize comparison data
-            logger.info(f"🔍 Validating comparison data for: {comparison_id}")
-            self._validate_comparison_data(comparison_data)
-            buffer = BytesIO()
-            doc = BorderedDocTemplate(
-                buffer,
-                pagesize=letter,
-                rightMargin=0.75*inch,
-                leftMargin=0.75*inch,
-                topMargin=1*inch,
-                bottomMargin=0.75*inch
-            )
+            logger.info("🔍 Validating comparison data for: %s", comparison_id)
+            view = self._validate_comparison_data(comparison_data)
+            doc = self._new_doc(sink)
             
             # Build PDF content
             story = []
             
             # Cover page with logo and company names
-            try:
-                logger.info("📄 Building cover page...")
-                story.extend(self._build_cover_page(comparison_data, comparison_id))
-                story.append(PageBreak())
-                logger.info("✅ Cover page built successfully")
-            except Exception as e:
-                logger.error(f"❌ Error building cover page: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
-                # Add fallback cover page
-                story.append(Paragraph("Insurance Quote Comparison Report", self.styles['CustomTitle']))
-                story.append(PageBreak())
+            with self._safe_section("cover page", story, fallback=lambda: self._fallback_cover(page_break=True)) as section:
+                section.extend(self._build_cover_page(view, comparison_id))
+                section.append(PageBreak())
             
             # ✨ STRATEGIC MEMO: 1-page Executive Brief (high-level summary)
-            try:
-                logger.info("📄 Building strategic executive memo (1-page brief)...")
-                story.extend(self._build_strategic_memo(comparison_data))
-                logger.info("✅ Strategic memo built successfully")
-            except Exception as e:
-                logger.error(f"❌ Error building strategic memo: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+            with self._safe_section("strategic executive memo (1-page brief)", story) as section:
+                section.extend(self._build_strategic_memo(view))
             
             # ✨ DETAILED ANALYSIS: Granular technical report with recommendations
             # (Page break handled inside _build_detailed_comparison_factors)
-            try:
-                logger.info("📄 Building detailed comparison factors...")
-                story.extend(self._build_detailed_comparison_factors(comparison_data))
-                story.append(Spacer(1, 0.3*inch))
-                logger.info("✅ Detailed comparison factors built successfully")
-            except Exception as e:
-                logger.error(f"❌ Error building detailed comparison factors: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+            with self._safe_section("detailed comparison factors", story) as section:
+                section.extend(self._build_detailed_comparison_factors(view))
+                section.append(Spacer(1, 0.3*inch))
             
             # Key Differences section
-            try:
-                logger.info("📄 Building key differences section...")
-                story.extend(self._build_key_differences_section(comparison_data))
-                story.append(Spacer(1, 0.3*inch))
-                logger.info("✅ Key differences section built successfully")
-            except Exception as e:
-                logger.error(f"❌ Error building key differences section: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+            with self._safe_section("key differences section", story) as section:
+                section.extend(self._build_key_differences_section(view))
+                section.append(Spacer(1, 0.3*inch))
             
             # Data Table section (improved formatting)
-            try:
-                logger.info("📄 Building data table section...")
-                story.extend(self._build_data_table_section(comparison_data))
-                story.append(Spacer(1, 0.3*inch))
-                logger.info("✅ Data table section built successfully")
-            except Exception as e:
-                logger.error(f"❌ Error building data table section: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+            with self._safe_section("data table section", story) as section:
+                section.extend(self._build_data_table_section(view))
+                section.append(Spacer(1, 0.3*inch))
             
             # Side-by-Side section
-            try:
-                logger.info("📄 Building side-by-side section...")
-                story.extend(self._build_side_by_side_section(comparison_data))
-                story.append(Spacer(1, 0.3*inch))
-                logger.info("✅ Side-by-side section built successfully")
-            except Exception as e:
-                logger.error(f"❌ Error building side-by-side section: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+            with self._safe_section("side-by-side section", story) as section:
+                section.extend(self._build_side_by_side_section(view))
+                section.append(Spacer(1, 0.3*inch))
             
             # Analytics/Charts section (improved formatting)
-            try:
-                logger.info("📄 Building analytics section...")
-                story.extend(self._build_analytics_section(comparison_data))
-                logger.info("✅ Analytics section built successfully")
-            except Exception as e:
-                logger.error(f"❌ Error building analytics section: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+            with self._safe_section("analytics section", story) as section:
+                section.extend(self._build_analytics_section(view))
             
             # Build PDF
             doc.build(story)
-            buffer.seek(0)
             
-            logger.info(f"✅ Generated enhanced PDF for comparison: {comparison_id}")
-            return buffer
+            logger.info("✅ Generated enhanced PDF for comparison: %s", comparison_id)
             
         except IndexError as e:
-            logger.error(f"❌ Index error generating PDF: {e}")
-            import traceback
+            logger.error("❌ Index error generating PDF: %s", e)
             logger.error(traceback.format_exc())
             raise Exception(f"PDF generation failed: list index out of range - {str(e)}")
         except Exception as e:
-            logger.error(f"❌ Error generating PDF: {e}")
-            import traceback
+            logger.error("❌ Error generating PDF: %s", e)
             logger.error(traceback.format_exc())
             raise
     
@@ -411,78 +1149,59 @@ class PDFGeneratorService:
         comparison_data: Dict[str, Any],
         comparison_id: str
     ) -> BytesIO:
+        """Generate the 1-page strategic memo PDF into a BytesIO buffer (see generate_strategic_memo_pdf_to)."""
+        buffer = BytesIO()
+        self.generate_strategic_memo_pdf_to(buffer, comparison_data, comparison_id)
+        buffer.seek(0)
+        return buffer
+    
+    def generate_strategic_memo_pdf_to(
+        self,
+        sink: BinaryIO,
+        comparison_data: Dict[str, Any],
+        comparison_id: str
+    ) -> None:
         """
-        Generate 1-page strategic memo PDF report.
+        Render 1-page strategic memo PDF report into sink.
         
         This is a high-level executive brief optimized for decision makers.
         
         Args:
+            sink: Writable binary stream the PDF is written to
             comparison_data: Complete comparison data from API
             comparison_id: Comparison ID for filename
-            
-        Returns:
-            BytesIO buffer containing PDF bytes
         """
-        if not REPORTLAB_AVAILABLE:
-            raise ImportError(
-                "ReportLab is not installed. Please install it with: pip install reportlab==4.2.5"
-            )
+        _require_reportlab()
         
         try:
-            logger.info(f"🔍 Generating 1-page strategic memo for: {comparison_id}")
-            self._validate_comparison_data(comparison_data)
-            buffer = BytesIO()
-            doc = BorderedDocTemplate(
-                buffer,
-                pagesize=letter,
-                rightMargin=0.75*inch,
-                leftMargin=0.75*inch,
-                topMargin=1*inch,
-                bottomMargin=0.75*inch
-            )
+            logger.info("🔍 Generating 1-page strategic memo for: %s", comparison_id)
+            view = self._validate_comparison_data(comparison_data)
+            doc = self._new_doc(sink)
             
             story = []
             
             # Cover page with logo
-            try:
-                logger.info("📄 Building cover page for strategic memo...")
-                story.extend(self._build_cover_page(comparison_data, comparison_id))
-                story.append(PageBreak())
-                logger.info("✅ Cover page built successfully")
-            except Exception as e:
-                logger.error(f"❌ Error building cover page: {e}")
-                story.append(Paragraph("Insurance Quote Comparison Report", self.styles['CustomTitle']))
-                story.append(PageBreak())
-            
-            # Strategic memo (1-page only)
-            try:
-                logger.info("📄 Building strategic executive memo (1-page brief)...")
-                memo_content = self._build_strategic_memo(comparison_data)
-                if memo_content:
-                    story.extend(memo_content)
-                    logger.info(f"✅ Strategic memo built successfully with {len(memo_content)} elements")
+            with self._safe_section("cover page for strategic memo", story, fallback=lambda: self._fallback_cover(page_break=True)) as section:
+                section.extend(self._build_cover_page(view, comparison_id))
+                section.append(PageBreak())
+            
+            # Strategic memo (1-page only) - fallback content so PDF still generates
+            with self._safe_section("strategic executive memo (1-page brief)", story, fallback=self._fallback_memo) as section:
+                section.extend(self._build_strategic_memo(view))
+                if section:
+                    logger.info("✅ Strategic memo built with %s elements", len(section))
                 else:
                     logger.warning("⚠️  Strategic memo returned empty content, adding fallback")
-                    story.append(Paragraph("Strategic Analysis", self.styles['SectionHeading']))
-                    story.append(Paragraph("Please refer to the detailed comparison report for comprehensive analysis.", self.styles['CustomBodyText']))
-            except Exception as e:
-                logger.error(f"❌ Error building strategic memo: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
-                # Add fallback content so PDF still generates
-                story.append(Paragraph("Strategic Analysis", self.styles['SectionHeading']))
-                story.append(Paragraph("An error occurred while generating the strategic memo. Please refer to the detailed comparison report.", self.styles['CustomBodyText']))
+                    section.append(Paragraph("Strategic Analysis", self.styles['SectionHeading']))
+                    section.append(Paragraph("Please refer to the detailed comparison report for comprehensive analysis.", self.styles['CustomBodyText']))
             
             # Build PDF
             doc.build(story)
-            buffer.seek(0)
             
-            logger.info(f"✅ Generated strategic memo PDF for comparison: {comparison_id}")
-            return buffer
+            logger.info("✅ Generated strategic memo PDF for comparison: %s", comparison_id)
             
         except Exception as e:
-            logger.error(f"❌ Error generating strategic memo PDF: {e}")
-            import traceback
+            logger.error("❌ Error generating strategic memo PDF: %s", e)
             logger.error(traceback.format_exc())
             raise
     
@@ -491,196 +1210,162 @@ class PDFGeneratorService:
         comparison_data: Dict[str, Any],
         comparison_id: str
     ) -> BytesIO:
+        """Generate the detailed comparison PDF into a BytesIO buffer (see generate_detailed_comparison_pdf_to)."""
+        buffer = BytesIO()
+        self.generate_detailed_comparison_pdf_to(buffer, comparison_data, comparison_id)
+        buffer.seek(0)
+        return buffer
+    
+    def generate_detailed_comparison_pdf_to(
+        self,
+        sink: BinaryIO,
+        comparison_data: Dict[str, Any],
+        comparison_id: str
+    ) -> None:
         """
-        Generate detailed comparison PDF report.
+        Render detailed comparison PDF report into sink.
         
         This is a comprehensive technical report with all comparison details.
         
         Args:
+            sink: Writable binary stream the PDF is written to
             comparison_data: Complete comparison data from API
             comparison_id: Comparison ID for filename
-            
-        Returns:
-            BytesIO buffer containing PDF bytes
         """
-        if not REPORTLAB_AVAILABLE:
-            raise ImportError(
-                "ReportLab is not installed. Please install it with: pip install reportlab==4.2.5"
-            )
+        _require_reportlab()
         
         try:
-            logger.info(f"🔍 Generating detailed comparison PDF for: {comparison_id}")
-            self._validate_comparison_data(comparison_data)
-            buffer = BytesIO()
-            doc = BorderedDocTemplate(
-                buffer,
-                pagesize=letter,
-                rightMargin=0.75*inch,
-                leftMargin=0.75*inch,
-                topMargin=1*inch,
-                bottomMargin=0.75*inch
-            )
+            logger.info("🔍 Generating detailed comparison PDF for: %s", comparison_id)
+            view = self._validate_comparison_data(comparison_data)
+            doc = self._new_doc(sink)
             
             story = []
             
             # Cover page with logo
-            try:
-                logger.info("📄 Building cover page for detailed comparison...")
-                story.extend(self._build_cover_page(comparison_data, comparison_id))
-                # Note: PageBreak is handled inside _build_detailed_comparison_factors
-                logger.info("✅ Cover page built successfully")
-            except Exception as e:
-                logger.error(f"❌ Error building cover page: {e}")
-                story.append(Paragraph("Insurance Quote Comparison Report", self.styles['CustomTitle']))
-                # Note: PageBreak is handled inside _build_detailed_comparison_factors
+            # Note: PageBreak is handled inside _build_detailed_comparison_factors
+            with self._safe_section("cover page for detailed comparison", story, fallback=lambda: self._fallback_cover(page_break=False)) as section:
+                section.extend(self._build_cover_page(view, comparison_id))
             
             # Detailed Analysis section (this will add its own PageBreak to start on new page)
-            try:
-                logger.info("📄 Building detailed comparison factors...")
-                story.extend(self._build_detailed_comparison_factors(comparison_data))
-                story.append(Spacer(1, 0.3*inch))
-                logger.info("✅ Detailed comparison factors built successfully")
-            except Exception as e:
-                logger.error(f"❌ Error building detailed comparison factors: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+            with self._safe_section("detailed comparison factors", story) as section:
+                section.extend(self._build_detailed_comparison_factors(view))
+                section.append(Spacer(1, 0.3*inch))
             
             # Analytics/Charts section (keep only overall score comparison, remove other duplicated tables)
-            try:
-                logger.info("📄 Building analytics section (overall score comparison only)...")
-                story.extend(self._build_analytics_section(comparison_data))
-                logger.info("✅ Analytics section built successfully")
-            except Exception as e:
-                logger.error(f"❌ Error building analytics section: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+            with self._safe_section("analytics section (overall score comparison only)", story) as section:
+                section.extend(self._build_analytics_section(view))
             
             # Build PDF
             doc.build(story)
-            buffer.seek(0)
             
-            logger.info(f"✅ Generated detailed comparison PDF for comparison: {comparison_id}")
-            return buffer
+            logger.info("✅ Generated detailed comparison PDF for comparison: %s", comparison_id)
             
         except Exception as e:
-            logger.error(f"❌ Error generating detailed comparison PDF: {e}")
-            import traceback
+            logger.error("❌ Error generating detailed comparison PDF: %s", e)
             logger.error(traceback.format_exc())
             raise
     
     def _build_cover_page(
         self,
-        comparison_data: Dict[str, Any],
+        view: _ComparisonView,
         comparison_id: str
-    ) -> List:
+    ) -> Iterator:
         """Build minimalist cover page with centered logo and title."""
-        story = []
         
         # Add some top spacing
-        story.append(Spacer(1, 2*inch))
+        yield Spacer(1, 2*inch)
         
         # Logo at top (larger and centered)
         logo = self._create_logo_element(width=3*inch)
         if logo:
             logo.hAlign = 'CENTER'
-            story.append(logo)
-            story.append(Spacer(1, 0.5*inch))
+            yield logo
+            yield Spacer(1, 0.5*inch)
         else:
             # Text logo if image not available
             logo_text = Paragraph("HAKEM.AI", self.styles['CustomTitle'])
             logo_text.alignment = TA_CENTER
-            story.append(logo_text)
-            story.append(Spacer(1, 0.5*inch))
+            yield logo_text
+            yield Spacer(1, 0.5*inch)
         
         # Centered title
         title = Paragraph("AI Powered Comparison Report", self.styles['CustomTitle'])
         title.alignment = TA_CENTER
-        story.append(title)
+        yield title
         
         # Add date info (comparison ID removed per user request)
-        story.append(Spacer(1, 0.3*inch))
+        yield Spacer(1, 0.3*inch)
         date_text = Paragraph(
-            f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}",
-            ParagraphStyle(
-                'CoverDate',
-                parent=self.styles['Normal'],
-                fontSize=10,
-                textColor=colors.grey,
-                alignment=TA_CENTER,
-                spaceAfter=12
-            )
+            f"Generated on {view.generated_at.strftime('%B %d, %Y at %I:%M %p')}",
+            self.styles['CoverDate']
         )
-        story.append(date_text)
+        yield date_text
         
         # Add bottom spacing to ensure content is visible
-        story.append(Spacer(1, 1*inch))
-        
-        return story
+        yield Spacer(1, 1*inch)
     
-    def _build_strategic_memo(self, comparison_data: Dict[str, Any]) -> List:
+    def _build_strategic_memo(self, view: _ComparisonView) -> Iterator:
         """
         ✨ STRATEGIC MEMO: 1-page high-level Executive Brief for decision makers.
         Optimized to fit exactly 1 page with concise strategic insights.
         """
-        story = []
         
         # Memo header - smaller to save space
         memo_header = Paragraph("EXECUTIVE BRIEF", self.styles['CustomTitle'])
-        story.append(memo_header)
-        story.append(Spacer(1, 0.15*inch))
+        yield memo_header
+        yield Spacer(1, 0.15*inch)
         
         # To/From/Date/Subject section - more compact
-        memo_info_style = ParagraphStyle(
-            'MemoInfo',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            textColor=colors.black,
-            spaceAfter=3,
-            leftIndent=0.3*inch
-        )
+        memo_info_style = self.styles['MemoInfo']
         
         # Extract line of insurance from comparison data
         line_of_insurance = "Property Insurance"  # Default
-        extracted_quotes = comparison_data.get("extracted_quotes", [])
-        if extracted_quotes and len(extracted_quotes) > 0:
+        extracted_quotes = view.extracted_quotes
+        if extracted_quotes:
             # Try to get from first quote
             first_quote = extracted_quotes[0]
             line_of_insurance = first_quote.get("policy_type") or first_quote.get("insurance_type") or first_quote.get("line_of_business") or "Property Insurance"
         
         memo_info = [
-            f"<b>TO:</b> Decision Makers | <b>DATE:</b> {datetime.now().strftime('%B %d, %Y')}",
+            f"<b>TO:</b> Decision Makers | <b>DATE:</b> {view.generated_at.strftime('%B %d, %Y')}",
             f"<b>SUBJECT:</b> Insurance Quote Comparison - Strategic Recommendation",
             f"<b>Line of Insurance:</b> {line_of_insurance}"
         ]
         
-        for info in memo_info:
-            story.append(Paragraph(info, memo_info_style))
+        # One multi-line paragraph instead of a flowable per line
+        yield Paragraph("<br/>".join(memo_info), memo_info_style)
         
-        story.append(Spacer(1, 0.15*inch))
+        yield Spacer(1, 0.15*inch)
         
         # Executive Summary - Compact version
-        summary = comparison_data.get("summary", {})
-        key_differences = comparison_data.get("key_differences", {})
-        data_table = comparison_data.get("data_table", {})
-        rows = data_table.get("rows", [])  # Get rows early for use in recommendation
+        key_differences = view.key_differences
+        rows = view.row_dicts  # Get rows early for use in recommendation
         
-        story.append(Paragraph("STRATEGIC ANALYSIS", self.styles['SectionHeading']))
-        story.append(Spacer(1, 0.08*inch))
+        yield Paragraph("STRATEGIC ANALYSIS", self.styles['SectionHeading'])
+        yield Spacer(1, 0.08*inch)
         
         # Get key metrics
-        ranking = summary.get("ranking", [])
+        ranking = view.ranking
         total_providers = len(ranking)
         
         if ranking:
-            best_provider = ranking[0] if ranking else {}
+            best_provider = ranking[0]
             best_name = best_provider.get("company", "N/A")
             best_score = best_provider.get("score", 0)
             best_premium = best_provider.get("premium", 0)
             
-            # Calculate price range
-            premiums = [r.get("premium", 0) for r in ranking if isinstance(r, dict)]
-            price_range_low = min(premiums) if premiums else 0
-            price_range_high = max(premiums) if premiums else 0
+            # Calculate price range in one pass over the ranking
+            price_range_low = price_range_high = None
+            for r in ranking:
+                premium = r.get("premium", 0)
+                if price_range_low is None:
+                    price_range_low = price_range_high = premium
+                elif premium < price_range_low:
+                    price_range_low = premium
+                elif premium > price_range_high:
+                    price_range_high = premium
+            if price_range_low is None:
+                price_range_low = price_range_high = 0
             price_variance = ((price_range_high - price_range_low) / price_range_low * 100) if price_range_low > 0 else 0
             
             # Show actual number of providers analyzed
@@ -689,11 +1374,11 @@ class PDFGeneratorService:
             
             # Strategic overview - show actual count
             overview_text = f"""
-            Analyzed <b>{actual_provider_count} providers</b>. <b>{best_name}</b> ranks #1 with score {best_score:.1f} at SAR {best_premium:,.2f}. 
+            Analyzed <b>{actual_provider_count} providers</b>. <b>{escape(str(best_name))}</b> ranks #1 with score {best_score:.1f} at SAR {best_premium:,.2f}. 
             Premium variance: {price_variance:.1f}% (SAR {price_range_low:,.2f} - SAR {price_range_high:,.2f}).
             """
-            story.append(Paragraph(overview_text, self.styles['CustomBodyText']))
-            story.append(Spacer(1, 0.1*inch))
+            yield Paragraph(overview_text, self.styles['CustomBodyText'])
+            yield Spacer(1, 0.1*inch)
         
         # Strategic Recommendation - more compact
         recommendation = key_differences.get("recommendation", "")
@@ -703,17 +1388,16 @@ class PDFGeneratorService:
         deductibles = []
         try:
             for row in rows:
-                if isinstance(row, dict):
-                    deductible = row.get("deductible") or row.get("deductible_amount")
-                    if deductible:
-                        deductibles.append(deductible)
+                deductible = row.get("deductible") or row.get("deductible_amount")
+                if deductible:
+                    deductibles.append(deductible)
         except Exception as e:
-            logger.warning(f"⚠️  Error extracting deductibles: {e}")
+            logger.warning("⚠️  Error extracting deductibles: %s", e)
             deductibles = []
         
         # If no recommendation from key_differences, try to get from ranking
         if not recommendation and ranking:
-            best_provider = ranking[0] if ranking else {}
+            best_provider = ranking[0]
             recommendation = best_provider.get("company", "Top-ranked provider")
         
         if recommendation:
@@ -722,50 +1406,7 @@ class PDFGeneratorService:
                 # Remove any sum insured or coverage limit mentions (since it's fixed for all insurers)
                 updated_reasoning = recommendation_reasoning
                 
-                # CRITICAL FIX: Clarify premium comparisons - fix confusing sentence structure
-                # Fix pattern: "and a [low/competitive] rate of X, significantly lower than Provider's SAR Y"
-                # Replace with: "with a [low/competitive] rate of X, compared to Provider's premium of SAR Y"
-                def fix_premium_comparison(match):
-                    rate_adj = match.group(2) + ' ' if match.group(2) else ''
-                    rate_type = match.group(3)
-                    rate_val = match.group(4)
-                    provider = match.group(6)
-                    premium_val = match.group(7)
-                    return f"with {rate_adj}{rate_type} of {rate_val}, compared to {provider}'s premium of SAR {premium_val}"
-                
-                updated_reasoning = re.sub(
-                    r'\band\s+(a|an)?\s*(low|high|competitive)?\s*(rate|premium)\s+of\s+([^,]+),\s+significantly\s+(lower|higher)\s+than\s+([A-Za-z\s\']+?)\'s\s+SAR\s+([\d,]+\.?\d*)',
-                    fix_premium_comparison,
-                    updated_reasoning,
-                    flags=re.IGNORECASE
-                )
-                # More general fix: "significantly lower than Provider's SAR X" -> "compared to Provider's premium of SAR X"
-                updated_reasoning = re.sub(
-                    r'\b(significantly|substantially)\s+(lower|higher)\s+than\s+([A-Za-z\s\']+?)\'s\s+SAR\s+([\d,]+\.?\d*)',
-                    r'compared to \3\'s premium of SAR \4',
-                    updated_reasoning,
-                    flags=re.IGNORECASE
-                )
-                # Fix: "Provider's SAR X" -> "Provider's premium of SAR X" (when not already "premium of")
-                updated_reasoning = re.sub(
-                    r'\b([A-Za-z\s\']+?)\'s\s+(?!premium\s+of\s+SAR)SAR\s+([\d,]+\.?\d*)(?=\s|\.|,|$)',
-                    r'\1\'s premium of SAR \2',
-                    updated_reasoning,
-                    flags=re.IGNORECASE
-                )
-                
-                # Remove explicit sum insured and coverage limit mentions
-                updated_reasoning = re.sub(r'\b(sum insured|Sum Insured|coverage limit|Coverage Limit|substantial coverage limit|total sum insured)\b[^.]*\.?', '', updated_reasoning, flags=re.IGNORECASE)
-                # Remove phrases with large numbers + billion/million (targeted: "offers a high 56 billion" pattern)
-                updated_reasoning = re.sub(r'\b(offers?|with|of|has|provides?)\s+(a|an)?\s*(high|total|maximum)?\s*[\d,]+\.?\d*\s*(billion|million)\b', '', updated_reasoning, flags=re.IGNORECASE)
-                # Remove standalone large numbers with billion/million (only very large numbers to avoid removing premiums)
-                updated_reasoning = re.sub(r'\b[\d,]{4,}\.?\d*\s*(billion|million)\b', '', updated_reasoning, flags=re.IGNORECASE)
-                # Remove SAR values with very large numbers (likely sum insured, not premiums)
-                updated_reasoning = re.sub(r'\b(SAR|SR)\s*[\d,]{9,}\b', '', updated_reasoning, flags=re.IGNORECASE)
-                # Clean up whitespace and punctuation
-                updated_reasoning = re.sub(r'\s+', ' ', updated_reasoning).strip()
-                updated_reasoning = re.sub(r'\s*,\s*,', ',', updated_reasoning)  # Remove double commas
-                updated_reasoning = re.sub(r'\s*\.\s*\.', '.', updated_reasoning)  # Remove double periods
+                updated_reasoning = _clean_recommendation_reasoning(updated_reasoning)
                 
                 # Add deductible consideration if we have deductible data
                 if deductibles:
@@ -777,41 +1418,42 @@ class PDFGeneratorService:
                 updated_reasoning += '.'
             
             rec_text = f"""
-            <b>Recommendation:</b> {recommendation}<br/>
-            <b>Rationale:</b> {updated_reasoning}
+            <b>Recommendation:</b> {escape(str(recommendation))}<br/>
+            <b>Rationale:</b> {escape(updated_reasoning)}
             """
-            story.append(Paragraph(rec_text, self.styles['Highlight']))
-            story.append(Spacer(1, 0.1*inch))
+            yield Paragraph(rec_text, self.styles['Highlight'])
+            yield Spacer(1, 0.1*inch)
         else:
             # Fallback recommendation if none available
             fallback_text = """
             <b>Recommendation:</b> Review all providers carefully based on your specific requirements.<br/>
             <b>Rationale:</b> Consider coverage adequacy, premium competitiveness, and policy terms when making your decision.
             """
-            story.append(Paragraph(fallback_text, self.styles['Highlight']))
-            story.append(Spacer(1, 0.1*inch))
+            yield Paragraph(fallback_text, self.styles['Highlight'])
+            yield Spacer(1, 0.1*inch)
         
         # Top Providers Comparison - Compact table (fit 8 companies)
         if len(ranking) >= 2:
-            story.append(Paragraph("PROVIDER COMPARISON", self.styles['SubsectionHeading']))
-            story.append(Spacer(1, 0.08*inch))
+            yield Paragraph("PROVIDER COMPARISON", self.styles['SubsectionHeading'])
+            yield Spacer(1, 0.08*inch)
             
             alt_data = [["Rank", "Provider", "Score", "Premium (SAR)"]]
+            body_style = self._body_style
             
             for i, provider in enumerate(ranking[:8], 1):  # Top 8 providers to fit on page
-                if isinstance(provider, dict):
-                    rank = str(i)
-                    company = provider.get("company", "N/A")
-                    score = f"{provider.get('score', 0):.1f}"
-                    premium = f"{provider.get('premium', 0):,.2f}"
-                    
-                    # Create paragraph for company name with appropriate font size
-                    # Font size will be handled by table style based on number of rows
-                    company_para = Paragraph(company, self.styles['CustomBodyText'])
-                    alt_data.append([rank, company_para, score, premium])
+                get = provider.get  # bound once for the three field reads
+                rank = str(i)
+                company = get("company", "N/A")
+                score = _FMT_1F(get('score', 0))
+                premium = _FMT_2F(get('premium', 0))
+                
+                # Create paragraph for company name with appropriate font size
+                # Font size will be handled by table style based on number of rows
+                company_para = Paragraph(escape(str(company)), body_style)
+                alt_data.append([rank, company_para, score, premium])
             
             if len(alt_data) > 1:
-                available_width = self.page_width - 1.5*inch
+                available_width = self._content_width
                 # Optimized column widths to fit up to 8 providers with minimum 9pt font
                 num_rows = len(alt_data) - 1  # Exclude header
                 # Use minimum 9pt font for readability, adjust padding based on rows
@@ -830,7 +1472,7 @@ class PDFGeneratorService:
                     available_width * 0.25   # Premium
                 ])
                 alt_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), HexColor('#4A7C2A')),
+                    ('BACKGROUND', (0, 0), (-1, 0), _MEDIUM_GREEN),
                     ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
                     ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
                     ('ALIGN', (1, 0), (1, -1), 'LEFT'),
@@ -844,17 +1486,17 @@ class PDFGeneratorService:
                     ('LEFTPADDING', (0, 0), (-1, -1), 3),  # Minimal side padding
                     ('RIGHTPADDING', (0, 0), (-1, -1), 3),
                     ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#F5F5F5')]),
+                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, _ALT_ROW_GREY]),
                 ]))
-                story.append(alt_table)
-                story.append(Spacer(1, 0.08*inch))  # Reduced spacing after table
+                yield alt_table
+                yield Spacer(1, 0.08*inch)  # Reduced spacing after table
         
         # Critical Decision Factors - Compact
-        story.append(Paragraph("KEY DECISION FACTORS", self.styles['SubsectionHeading']))
-        story.append(Spacer(1, 0.08*inch))
+        yield Paragraph("KEY DECISION FACTORS", self.styles['SubsectionHeading'])
+        yield Spacer(1, 0.08*inch)
         
         # Build decision factors from analytics
-        analytics = comparison_data.get("analytics", {})
+        analytics = view.analytics
         statistics = analytics.get("statistics", {})
         
         factors = []
@@ -865,15 +1507,10 @@ class PDFGeneratorService:
         
         # Coverage quality - use data_table rows to get actual benefits count
         if rows:
-            benefits_counts = []
-            for row in rows:
-                if isinstance(row, dict):
-                    benefits_val = row.get("benefits") or row.get("benefits_count") or 0
-                    if isinstance(benefits_val, list):
-                        benefits_counts.append(len(benefits_val))
-                    else:
-                        benefits_counts.append(int(benefits_val) if benefits_val else 0)
-            top_benefits_count = max(benefits_counts) if benefits_counts else 0
+            top_benefits_count = max(
+                (_benefits_count(row) for row in rows),
+                default=0
+            )
             if top_benefits_count > 0:
                 factors.append(f"• <b>Coverage:</b> Up to {top_benefits_count} benefits offered")
         
@@ -884,283 +1521,236 @@ class PDFGeneratorService:
         factors.append(f"• <b>Terms:</b> Verify subjectivities & conditions")
         
         # Create compact style for factors
-        compact_style = ParagraphStyle('CompactFactors', parent=self.styles['CustomBodyText'], fontSize=9, spaceAfter=3)
-        for factor in factors:
-            story.append(Paragraph(factor, compact_style))
+        compact_style = self.styles['CompactFactors']
+        yield Paragraph("<br/>".join(factors), compact_style)
         
-        story.append(Spacer(1, 0.2*inch))
+        yield Spacer(1, 0.2*inch)
         
         # Add Hakem.ai tagline at the bottom
-        tagline_style = ParagraphStyle(
-            'HakemTagline',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            textColor=HexColor('#4A7C2A'),
-            alignment=TA_CENTER,
-            spaceAfter=12,
-            fontName='Helvetica-Bold'
-        )
-        story.append(Spacer(1, 0.3*inch))
-        story.append(Paragraph("Hakem.ai — Empowering Smarter Decisions with Intelligence", tagline_style))
+        tagline_style = self.styles['HakemTagline']
+        yield Spacer(1, 0.3*inch)
+        yield Paragraph("Hakem.ai — Empowering Smarter Decisions with Intelligence", tagline_style)
+    
+    def _normalize_ranking(self, ranking: List[Any], limit: int) -> List[_RankItem]:
+        """Read the first `limit` summary ranking entries (already dict-only in the view) into _RankItems."""
+        return [
+            _RankItem(
+                company=item.get("company", "N/A"),
+                score=item.get("score", 0),
+                premium=item.get("premium", 0),
+                rate=item.get("rate", "N/A"),
+                rank=item.get("rank"),
+            )
+            for item in ranking[:limit]
+        ]
+    
+    def _normalize_rows(self, rows: List[Dict[str, Any]]) -> List[_ProviderRow]:
+        """
+        Extract the fields used by the detailed analysis tables from data_table rows.
         
-        return story
+        Each row is walked once here instead of re-running the same key fallbacks
+        and coercions in every table builder.
+        """
+        normalized = []
+        for row in rows:
+            name = row.get("provider_name") or row.get("provider") or row.get("company") or "N/A"
+            normalized.append(_ProviderRow(
+                name=name,
+                safe_name=escape(str(name)),
+                score=float(row.get("score") or row.get("hakim_score") or 0),
+                premium=float(row.get("premium") or row.get("premium_amount") or 0),
+                benefits_count=_benefits_count(row),
+                benefits=row.get("benefits"),
+                rate=row.get("rate") or "N/A",
+                rank=row.get("rank") or 0,
+            ))
+        return normalized
     
-    def _build_coverage_analysis_table(self, comparison_data: Dict[str, Any], story: List) -> None:
+    def _build_benefits_index(
+        self,
+        providers_data: List[Dict[str, Any]],
+        extracted_quotes: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, List], List[Tuple[str, List]]]:
+        """
+        Index fallback benefit lists for the benefits section.
+        
+        Returns a dict mapping side_by_side provider name/company to the first non-empty
+        benefits list, and the (company, benefits) pairs from extracted_quotes that have
+        non-empty benefits, in their original order for substring matching.
+        """
+        benefits_index = {}
+        for provider in providers_data:
+            benefits = provider.get("benefits", [])
+            if not isinstance(benefits, list) or not benefits:
+                continue
+            for key in (provider.get("name"), provider.get("company")):
+                if key:
+                    benefits_index.setdefault(key, benefits)
+        
+        quote_benefits = []
+        for quote in extracted_quotes:
+            quote_company = quote.get("company") or quote.get("insurer_name") or quote.get("provider_name")
+            benefits = quote.get("benefits", [])
+            if quote_company and isinstance(benefits, list) and benefits:
+                quote_benefits.append((quote_company, benefits))
+        
+        return benefits_index, quote_benefits
+    
+    def _build_coverage_row(self, row: _ProviderRow, providers_by_name: Dict[str, Dict[str, Any]]) -> List:
+        """Build one Coverage Analysis Table row: name, benefits, subjectivities and exclusions counts."""
+        provider = providers_by_name.get(row.name)
+        
+        # Get subjectivities count
+        subjectivities = provider.get("subjectivities", []) if provider else []
+        subj_count = len(subjectivities) if isinstance(subjectivities, list) else 0
+        
+        # Get exclusions count
+        exclusions = provider.get("exclusions", []) if provider else []
+        excl_count = len(exclusions) if isinstance(exclusions, list) else 0
+        
+        return [
+            self._fit_cell(row.name, self._body_style, self._content_width * 0.40, 12),
+            str(row.benefits_count),
+            str(subj_count),
+            str(excl_count)
+        ]
+    
+    def _build_provider_metric_table(self, header: List[str], body_rows: List[List], widths_ratio: List[float]) -> Table:
+        """Build a per-provider metric table (header + one row per provider) in the detailed analysis style."""
+        available_width = self._content_width
+        metric_table = Table([header] + body_rows, colWidths=[available_width * ratio for ratio in widths_ratio])
+        metric_table.setStyle(self._detail_table_style)
+        return metric_table
+    
+    def _build_coverage_analysis_table(self, view: _ComparisonView, provider_rows: List[_ProviderRow]) -> Iterator:
         """Build Coverage Analysis Table with all providers, subjectivities and exclusions counts."""
-        story.append(Paragraph("Coverage Analysis Table", self.styles['SubsectionHeading']))
-        story.append(Spacer(1, 0.08*inch))
+        yield Paragraph("Coverage Analysis Table", self.styles['SubsectionHeading'])
+        yield Spacer(1, 0.08*inch)
         
-        data_table = comparison_data.get("data_table", {})
-        rows = data_table.get("rows", [])
-        side_by_side = comparison_data.get("side_by_side", {})
-        providers_data = side_by_side.get("providers", []) if side_by_side else []
+        # Index side_by_side providers by name once; the first provider with a given name wins
+        providers_by_name = {}
+        for provider in view.providers:
+            providers_by_name.setdefault(provider.get("name"), provider)
         
-        if rows:
+        if provider_rows:
             # Table: Provider | Count of Benefits | Count of Subjectivities | Count of Exclusions (Benefits first as key comparative signal)
-            coverage_data = [["Provider", "Count of Benefits", "Count of Subjectivities", "Count of Exclusions"]]
+            coverage_rows = [self._build_coverage_row(row, providers_by_name) for row in provider_rows]  # ALL providers
             
-            for row in rows:  # ALL providers
-                if isinstance(row, dict):
-                    name = row.get("provider_name") or row.get("provider") or row.get("company") or "N/A"
-                    
-                    # Get benefits count
-                    benefits_val = row.get("benefits") or row.get("benefits_count") or 0
-                    if isinstance(benefits_val, list):
-                        benefits_count = len(benefits_val)
-                    else:
-                        benefits_count = int(benefits_val) if benefits_val else 0
-                    
-                    # Get subjectivities count
-                    subj_count = 0
-                    for provider in providers_data:
-                        if provider.get("name") == name:
-                            subjectivities = provider.get("subjectivities", [])
-                            subj_count = len(subjectivities) if isinstance(subjectivities, list) else 0
-                            break
-                    
-                    # Get exclusions count
-                    excl_count = 0
-                    for provider in providers_data:
-                        if provider.get("name") == name:
-                            exclusions = provider.get("exclusions", [])
-                            excl_count = len(exclusions) if isinstance(exclusions, list) else 0
-                            break
-                    
-                    name_para = Paragraph(str(name), self.styles['CustomBodyText'])
-                    coverage_data.append([
-                        name_para,
-                        str(benefits_count),
-                        str(subj_count),
-                        str(excl_count)
-                    ])
-            
-            if len(coverage_data) > 1:
-                available_width = self.page_width - 1.5*inch
-                coverage_table = Table(coverage_data, colWidths=[
-                    available_width * 0.40,
-                    available_width * 0.20,
-                    available_width * 0.20,
-                    available_width * 0.20
-                ])
-                coverage_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), HexColor('#4A7C2A')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('WORDWRAP', (0, 0), (-1, -1), True),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 9),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ('TOPPADDING', (0, 0), (-1, -1), 6),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#F5F5F5')]),
-                ]))
-                story.append(coverage_table)
-                story.append(Spacer(1, 0.1*inch))
+            if coverage_rows:
+                yield self._build_provider_metric_table(
+                    ["Provider", "Count of Benefits", "Count of Subjectivities", "Count of Exclusions"],
+                    coverage_rows,
+                    [0.40, 0.20, 0.20, 0.20]
+                )
+                yield Spacer(1, 0.1*inch)
                 
                 # Add technical recommendation one-liner
-                tech_rec_style = ParagraphStyle('TechRec', parent=self.styles['CustomBodyText'], 
-                                               fontSize=9, textColor=HexColor('#2D5016'), 
-                                               leftIndent=0.2*inch, spaceAfter=6)
-                story.append(Paragraph("<b>✓ Technical Recommendation:</b> Select providers with lower subjectivities and exclusions counts for better coverage terms.",
-                                     tech_rec_style))
-                story.append(Spacer(1, 0.15*inch))
-    
-    def _build_detailed_data_table_hakim_score(self, comparison_data: Dict[str, Any], story: List) -> None:
+                tech_rec_style = self.styles['TechRec']
+                yield Paragraph("<b>✓ Technical Recommendation:</b> Select providers with lower subjectivities and exclusions counts for better coverage terms.",
+                                     tech_rec_style)
+                yield Spacer(1, 0.15*inch)
+    
+    def _build_detailed_data_table_hakim_score(self, provider_rows: List[_ProviderRow]) -> Iterator:
         """Build Detailed Data Table ordered by Hakim Score (high to low), showing only Hakem Score."""
-        story.append(Paragraph("Detailed Data Table (Ordered by Hakim Score)", self.styles['SubsectionHeading']))
-        story.append(Spacer(1, 0.08*inch))
-        
-        data_table = comparison_data.get("data_table", {})
-        rows = data_table.get("rows", [])
+        yield Paragraph("Detailed Data Table (Ordered by Hakim Score)", self.styles['SubsectionHeading'])
+        yield Spacer(1, 0.08*inch)
         
-        if rows:
+        if provider_rows:
             # Sort by Hakim score (descending)
-            sorted_rows = sorted(
-                [r for r in rows if isinstance(r, dict)],
-                key=lambda x: float(x.get("score") or x.get("hakim_score") or 0),
-                reverse=True
-            )
+            sorted_provider_rows = sorted(provider_rows, key=_BY_SCORE, reverse=True)
             
             # Table: Provider | Hakim Score | Premium | Benefits | Rate | Rank (REMOVED Coverage column per requirement)
-            data_table_data = [["Provider", "Hakem Score", "Premium (SAR)", "Benefits", "Rate", "Rank"]]
-            
-            for row in sorted_rows:
-                name = row.get("provider_name") or row.get("provider") or row.get("company") or "N/A"
-                score = float(row.get("score") or row.get("hakim_score") or 0)
-                premium = float(row.get("premium") or row.get("premium_amount") or 0)
-                
-                # Get benefits count
-                benefits_val = row.get("benefits") or row.get("benefits_count") or 0
-                if isinstance(benefits_val, list):
-                    benefits = len(benefits_val)
-                else:
-                    benefits = int(benefits_val) if benefits_val else 0
-                
+            body_style = self._body_style
+            name_width = self._content_width * 0.30
+            data_table_rows = []
+            has_low_benefits = False
+            for row in sorted_provider_rows:
                 # Add note if benefits count is low (2 or less)
-                benefits_display = str(benefits)
-                if benefits <= 2:
-                    benefits_display += "*"
-                
-                rate = row.get("rate") or "N/A"
-                rank = row.get("rank") or 0
-                
-                name_para = Paragraph(str(name), self.styles['CustomBodyText'])
-                data_table_data.append([
-                    name_para,
-                    f"{score:.1f}",
-                    f"{premium:,.2f}",
-                    benefits_display,
-                    str(rate),
-                    str(rank)
-                ])
-            
-            if len(data_table_data) > 1:
-                available_width = self.page_width - 1.5*inch
-                detail_table = Table(data_table_data, colWidths=[
-                    available_width * 0.30,
-                    available_width * 0.15,
-                    available_width * 0.20,
-                    available_width * 0.15,
-                    available_width * 0.10,
-                    available_width * 0.10
-                ])
-                detail_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), HexColor('#4A7C2A')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('WORDWRAP', (0, 0), (-1, -1), True),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 9),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ('TOPPADDING', (0, 0), (-1, -1), 6),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#F5F5F5')]),
-                ]))
-                story.append(detail_table)
-                
-                # Add note about companies with few benefits
-                has_low_benefits = any(
-                    (int(row.get("benefits_count") or len(row.get("benefits", [])) or 0) if isinstance(row.get("benefits"), list) else int(row.get("benefits") or 0)) <= 2
-                    for row in sorted_rows
+                if row.benefits_count <= 2:
+                    benefits_cell = f"{row.benefits_count}*"
+                    has_low_benefits = True
+                else:
+                    benefits_cell = str(row.benefits_count)
+                data_table_rows.append([
+                    self._fit_cell(row.name, body_style, name_width, 12),
+                    _FMT_1F(row.score),
+                    _FMT_2F(row.premium),
+                    benefits_cell,
+                    str(row.rate),
+                    str(row.rank)
+                ])
+            
+            if data_table_rows:
+                yield self._build_provider_metric_table(
+                    ["Provider", "Hakem Score", "Premium (SAR)", "Benefits", "Rate", "Rank"],
+                    data_table_rows,
+                    [0.30, 0.15, 0.20, 0.15, 0.10, 0.10]
                 )
+                
+                # Add note about companies with few benefits (the rows marked with * above)
                 if has_low_benefits:
-                    note_style = ParagraphStyle('BenefitsNote', parent=self.styles['CustomBodyText'], 
-                                              fontSize=8, textColor=colors.grey, spaceAfter=6, leftIndent=0.2*inch)
-                    story.append(Spacer(1, 0.05*inch))
-                    story.append(Paragraph(
+                    note_style = self.styles['BenefitsNote']
+                    yield Spacer(1, 0.05*inch)
+                    yield Paragraph(
                         "<i>* Note: Some companies show limited benefits. Please revise insurance company's wording for full benefits under this line of business.</i>",
                         note_style
-                    ))
+                    )
                 
-                story.append(Spacer(1, 0.15*inch))
+                yield Spacer(1, 0.15*inch)
     
-    def _build_premium_comparison_table(self, comparison_data: Dict[str, Any], story: List) -> None:
+    def _build_premium_comparison_table(self, provider_rows: List[_ProviderRow]) -> Iterator:
         """Build Premium Comparison Table ordered by Premium (low to high)."""
-        story.append(Paragraph("Premium Comparison Table (Ordered by Premium)", self.styles['SubsectionHeading']))
-        story.append(Spacer(1, 0.08*inch))
-        
-        data_table = comparison_data.get("data_table", {})
-        rows = data_table.get("rows", [])
+        yield Paragraph("Premium Comparison Table (Ordered by Premium)", self.styles['SubsectionHeading'])
+        yield Spacer(1, 0.08*inch)
         
-        if rows:
+        if provider_rows:
             # Sort by Premium (ascending - lowest first)
-            sorted_rows = sorted(
-                [r for r in rows if isinstance(r, dict)],
-                key=lambda x: float(x.get("premium") or x.get("premium_amount") or 0)
-            )
+            sorted_rows = sorted(provider_rows, key=_BY_PREMIUM)
             
             # Table: Provider | Premium | Hakem Score | Benefits
-            premium_data = [["Provider", "Premium (SAR)", "Hakem Score", "Benefits Count"]]
-            
-            for row in sorted_rows:
-                name = row.get("provider_name") or row.get("provider") or row.get("company") or "N/A"
-                premium = float(row.get("premium") or row.get("premium_amount") or 0)
-                score = float(row.get("score") or row.get("hakim_score") or 0)
-                
-                # Get benefits count
-                benefits_val = row.get("benefits") or row.get("benefits_count") or 0
-                if isinstance(benefits_val, list):
-                    benefits = len(benefits_val)
-                else:
-                    benefits = int(benefits_val) if benefits_val else 0
-                
-                name_para = Paragraph(str(name), self.styles['CustomBodyText'])
-                premium_data.append([
-                    name_para,
-                    f"{premium:,.2f}",
-                    f"{score:.1f}",
-                    str(benefits)
-                ])
+            body_style = self._body_style
+            name_width = self._content_width * 0.40
+            premium_rows = [
+                [self._fit_cell(row.name, body_style, name_width, 12), _FMT_2F(row.premium), _FMT_1F(row.score), str(row.benefits_count)]
+                for row in sorted_rows
+            ]
             
-            if len(premium_data) > 1:
-                available_width = self.page_width - 1.5*inch
-                premium_table = Table(premium_data, colWidths=[
-                    available_width * 0.40,
-                    available_width * 0.25,
-                    available_width * 0.20,
-                    available_width * 0.15
-                ])
-                premium_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), HexColor('#4A7C2A')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('WORDWRAP', (0, 0), (-1, -1), True),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 9),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ('TOPPADDING', (0, 0), (-1, -1), 6),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#F5F5F5')]),
-                ]))
-                story.append(premium_table)
-                story.append(Spacer(1, 0.15*inch))
+            if premium_rows:
+                yield self._build_provider_metric_table(
+                    ["Provider", "Premium (SAR)", "Hakem Score", "Benefits Count"],
+                    premium_rows,
+                    [0.40, 0.25, 0.20, 0.15]
+                )
+                yield Spacer(1, 0.15*inch)
     
-    def _build_summary_statistics_table(self, comparison_data: Dict[str, Any], story: List) -> None:
+    def _build_summary_statistics_table(self, provider_rows: List[_ProviderRow]) -> Iterator:
         """Build Summary Statistics Table using Hakim scores and premiums."""
-        story.append(Paragraph("Summary Statistics Table", self.styles['SubsectionHeading']))
-        story.append(Spacer(1, 0.08*inch))
-        
-        data_table = comparison_data.get("data_table", {})
-        rows = data_table.get("rows", [])
-        
-        if rows:
-            # Calculate statistics
-            scores = [float(r.get("score") or r.get("hakim_score") or 0) for r in rows if isinstance(r, dict)]
-            premiums = [float(r.get("premium") or r.get("premium_amount") or 0) for r in rows if isinstance(r, dict)]
-            
-            best_score = max(scores) if scores else 0
-            worst_score = min(scores) if scores else 0
-            avg_score = sum(scores) / len(scores) if scores else 0
-            
-            highest_premium = max(premiums) if premiums else 0
-            lowest_premium = min(premiums) if premiums else 0
-            avg_premium = sum(premiums) / len(premiums) if premiums else 0
+        yield Paragraph("Summary Statistics Table", self.styles['SubsectionHeading'])
+        yield Spacer(1, 0.08*inch)
+        
+        if provider_rows:
+            # Calculate statistics in one pass, seeded from the first row
+            # (provider_rows is non-empty here, so no empty-list guards)
+            count = len(provider_rows)
+            first = provider_rows[0]
+            best_score = worst_score = total_score = first.score
+            highest_premium = lowest_premium = total_premium = first.premium
+            for row in provider_rows[1:]:
+                score = row.score
+                premium = row.premium
+                if score > best_score:
+                    best_score = score
+                elif score < worst_score:
+                    worst_score = score
+                if premium > highest_premium:
+                    highest_premium = premium
+                elif premium < lowest_premium:
+                    lowest_premium = premium
+                total_score += score
+                total_premium += premium
+            
+            avg_score = total_score / count
+            avg_premium = total_premium / count
             
             # Build statistics table
             stats_data = [
@@ -1170,153 +1760,148 @@ class PDFGeneratorService:
                 ["Average", f"{avg_score:.1f}", f"{avg_premium:,.2f}"]
             ]
             
-            available_width = self.page_width - 1.5*inch
+            available_width = self._content_width
             stats_table = Table(stats_data, colWidths=[
                 available_width * 0.40,
                 available_width * 0.30,
                 available_width * 0.30
             ])
-            stats_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#4A7C2A')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#F5F5F5')]),
-            ]))
-            story.append(stats_table)
-            story.append(Spacer(1, 0.15*inch))
-    
-    def _build_detailed_comparison_factors(self, comparison_data: Dict[str, Any]) -> List:
+            stats_table.setStyle(self._stats_table_style)
+            yield stats_table
+            yield Spacer(1, 0.15*inch)
+    
+    def _build_benefits_block(self, safe_name: str, benefits_list: List[Any], show_fallback: bool) -> KeepTogether:
+        """
+        Build one provider's benefits listing (name, all benefits, total) as a single flowable.
+        
+        Grouping keeps the heading with its list and lets Platypus place the block as a unit
+        instead of checking a page boundary after every piece.
+        """
+        block = [
+            Paragraph(f"<b>{safe_name}</b>", self.styles['CompanyName']),
+            Spacer(1, 0.05*inch)
+        ]
+        
+        # Display ALL benefits - no truncation, no limit
+        benefits_text = [_BULLET + escape(text) for text in map(_as_text, benefits_list) if self._is_valid_item_text(text)]
+        
+        if benefits_text:
+            # Create a compact paragraph style for benefits
+            benefits_style = self.styles['BenefitsText']
+            
+            # Display all benefits as one paragraph so ReportLab parses and wraps once
+            block.append(Paragraph("<br/>".join(benefits_text), benefits_style))
+            
+            # Show total count at the end
+            total_benefits = len(benefits_text)
+            block.append(Paragraph(
+                f"<i>(Total: {total_benefits} benefits)</i>",
+                self.styles['TotalBenefits']
+            ))
+        elif show_fallback:
+            block.append(Paragraph("• Standard benefits apply", self.styles['CustomBodyText']))
+        
+        return KeepTogether(block)
+    
+    def _build_detailed_comparison_factors(self, view: _ComparisonView) -> Iterator:
         """
         ✨ DETAILED ANALYSIS: Granular technical report with recommendations.
         Comprehensive comparison of all factors with technical insights.
         """
-        story = []
+        # Bind every input once; the sections below only read these locals
+        extracted_quotes = view.extracted_quotes
+        rows = view.rows
+        providers_data = view.providers
+        ranking = view.ranking
+        key_differences = view.key_differences
         
         # Clear section header for Detailed Analysis
-        story.append(PageBreak())  # Ensure detailed analysis starts on new page
+        yield PageBreak()  # Ensure detailed analysis starts on new page
         detail_title = Paragraph("DETAILED TECHNICAL COMPARISON", self.styles['CustomTitle'])
-        story.append(detail_title)
-        story.append(Spacer(1, 0.05*inch))  # Reduced spacing
+        yield detail_title
+        yield Spacer(1, 0.05*inch)  # Reduced spacing
+        
+        # Nothing to analyse - skip empty section headings and the blank tables page
+        if not rows and not providers_data and not extracted_quotes:
+            yield Paragraph("No detailed comparison data available.", self.styles['CustomBodyText'])
+            yield Spacer(1, 0.15*inch)
+            return
         
         # Extract line of business and total sum insured (sum insured is same for all providers)
         # Extract from multiple sources to ensure consistency - use the first valid value found
         line_of_business = "Property Insurance"  # Default
         total_sum_insured = 0
-        extracted_quotes = comparison_data.get("extracted_quotes", [])
-        data_table = comparison_data.get("data_table", {})
-        rows = data_table.get("rows", [])
-        side_by_side = comparison_data.get("side_by_side", {})
-        
-        # Helper function to extract numeric value from sum insured field
-        def extract_sum_insured_numeric(value):
-            """Extract numeric sum insured value from various formats."""
-            if not value:
-                return 0
-            if isinstance(value, (int, float)):
-                return float(value)
-            if isinstance(value, str):
-                # Remove common prefixes and extract numbers
-                cleaned = re.sub(r'[^\d,.]', '', value.replace(" ", ""))
-                numbers = re.findall(r'[\d,]+\.?\d*', cleaned)
-                if numbers:
-                    # Get the largest number (sum insured is usually the largest value)
-                    largest_num = max(numbers, key=lambda x: len(x.replace(",", "").replace(".", "")))
-                    try:
-                        return float(largest_num.replace(",", ""))
-                    except (ValueError, AttributeError):
-                        return 0
-            return 0
+        
+        # Normalize rows once - reused by every table and the benefits section below
+        provider_rows = self._normalize_rows(view.row_dicts)
         
         # Priority 1: Try extracted_quotes (most reliable source)
-        if extracted_quotes and len(extracted_quotes) > 0:
+        if extracted_quotes:
             first_quote = extracted_quotes[0]
             line_of_business = first_quote.get("policy_type") or first_quote.get("insurance_type") or first_quote.get("line_of_business") or "Property Insurance"
             # Try multiple field names
             for field in ["sum_insured", "sum_insured_total", "coverage_limit", "coverage", "total_sum_insured"]:
                 sum_insured_val = first_quote.get(field)
                 if sum_insured_val:
-                    total_sum_insured = extract_sum_insured_numeric(sum_insured_val)
+                    total_sum_insured = _extract_sum_insured_numeric(sum_insured_val)
                     if total_sum_insured > 0:
                         break
         
         # Priority 2: Try data_table rows (fallback)
         if total_sum_insured == 0 and rows:
-            for row in rows:
-                if isinstance(row, dict):
-                    for field in ["sum_insured", "coverage_limit", "coverage", "sum_insured_total"]:
-                        coverage_val = row.get(field)
-                        if coverage_val:
-                            total_sum_insured = extract_sum_insured_numeric(coverage_val)
-                            if total_sum_insured > 0:
-                                break
-                    if total_sum_insured > 0:
-                        break
+            for row in view.row_dicts:
+                for field in ["sum_insured", "coverage_limit", "coverage", "sum_insured_total"]:
+                    coverage_val = row.get(field)
+                    if coverage_val:
+                        total_sum_insured = _extract_sum_insured_numeric(coverage_val)
+                        if total_sum_insured > 0:
+                            break
+                if total_sum_insured > 0:
+                    break
         
         # Store sum insured value for consistent use throughout (used ONLY in header, NOT in rationale)
         _total_sum_insured_value = total_sum_insured
         
         # Add line of business and sum insured information at the top
-        intro_info_style = ParagraphStyle(
-            'IntroInfo',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            textColor=HexColor('#2D5016'),
-            spaceAfter=8,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
+        intro_info_style = self.styles['IntroInfo']
         intro_info = f"<b>Line of Business:</b> {line_of_business}"
         if _total_sum_insured_value > 0:
             intro_info += f" | <b>Total Sum Insured:</b> SAR {_total_sum_insured_value:,.2f}"
-        story.append(Paragraph(intro_info, intro_info_style))
-        story.append(Spacer(1, 0.15*inch))
+        yield Paragraph(intro_info, intro_info_style)
+        yield Spacer(1, 0.15*inch)
         
         # ============================================================================
         # PART 1: TABLES FIRST (as per client requirement)
         # ============================================================================
         
-        # 1. Coverage Analysis Table (with subjectivities and exclusions counts)
-        self._build_coverage_analysis_table(comparison_data, story)
-        
-        # 2. Detailed Data Table (ordered by Hakim Score)
-        self._build_detailed_data_table_hakim_score(comparison_data, story)
-        
-        # 3. Premium Comparison Table (ordered by Premium low to high)
-        self._build_premium_comparison_table(comparison_data, story)
-        
-        # 4. Summary Statistics Table
-        self._build_summary_statistics_table(comparison_data, story)
-        
-        story.append(PageBreak())  # Page break after tables
+        # Every table is built from the data_table rows - without them PART 1 would be bare headings
+        if provider_rows:
+            # 1. Coverage Analysis Table (with subjectivities and exclusions counts)
+            yield from self._build_coverage_analysis_table(view, provider_rows)
+            
+            # 2. Detailed Data Table (ordered by Hakim Score)
+            yield from self._build_detailed_data_table_hakim_score(provider_rows)
+            
+            # 3. Premium Comparison Table (ordered by Premium low to high)
+            yield from self._build_premium_comparison_table(provider_rows)
+            
+            # 4. Summary Statistics Table
+            yield from self._build_summary_statistics_table(provider_rows)
+            
+            yield PageBreak()  # Page break after tables
         
         # ============================================================================
         # PART 2: TECHNICAL DETAILS FOLLOW
         # ============================================================================
         
-        story.append(Paragraph("TECHNICAL DETAILS & ANALYSIS", self.styles['SectionHeading']))
-        story.append(Spacer(1, 0.1*inch))
-        
-        summary = comparison_data.get("summary", {})
-        ranking = summary.get("ranking", [])
-        side_by_side = comparison_data.get("side_by_side", {})
-        key_differences = comparison_data.get("key_differences", {})
-        data_table = comparison_data.get("data_table", {})
-        rows = data_table.get("rows", [])
+        yield Paragraph("TECHNICAL DETAILS & ANALYSIS", self.styles['SectionHeading'])
+        yield Spacer(1, 0.1*inch)
         
         # 1. Subjectivities Aggregated Table
-        story.append(Paragraph("1. Policy Subjectivities (Aggregated)", self.styles['SubsectionHeading']))
-        story.append(Spacer(1, 0.08*inch))
-        
-        providers_data = side_by_side.get("providers", []) if side_by_side else []
-        
         if providers_data:
+            yield Paragraph("1. Policy Subjectivities (Aggregated)", self.styles['SubsectionHeading'])
+            yield Spacer(1, 0.08*inch)
+            
             # Collect all unique subjectivities
             all_subjectivities = set()
             provider_subj_map = {}
@@ -1327,7 +1912,7 @@ class PDFGeneratorService:
                 provider_subj_map[provider_name] = set()
                 
                 for subj in subjectivities:
-                    subj_text = str(subj) if isinstance(subj, str) else subj.get("text", str(subj))
+                    subj_text = _as_text(subj)
                     if self._is_valid_item_text(subj_text):
                         all_subjectivities.add(subj_text)
                         provider_subj_map[provider_name].add(subj_text)
@@ -1358,21 +1943,21 @@ class PDFGeneratorService:
                     return full_name[:15]  # Truncate if still long
                 
                 # Build subjectivities table with Y/N or check/cross (improved readability)
-                subj_list = sorted(list(all_subjectivities))[:10]  # Limit to top 10
+                subj_list = heapq.nsmallest(10, all_subjectivities)  # Limit to top 10 (same order as sorted()[:10])
                 # Use short names for header
                 provider_short_names = [get_short_name(p.get("name", "Provider")) for p in providers_data[:5]]
                 # Improved header with better wrapping
-                header_cell_style = ParagraphStyle('SubjHeader', parent=self.styles['CustomBodyText'], fontSize=8, fontName='Helvetica-Bold', wordWrap='LTR', leading=10)
-                header_row = [Paragraph("Subjectivity", header_cell_style)] + [Paragraph(name, header_cell_style) for name in provider_short_names]
+                header_cell_style = self.styles['SubjHeader']
+                header_row = [Paragraph("Subjectivity", header_cell_style)] + [Paragraph(escape(name), header_cell_style) for name in provider_short_names]
                 subj_table_data = [header_row]
                 
                 # Improved cell style for better text wrapping
-                subj_cell_style = ParagraphStyle('SubjCell', parent=self.styles['CustomBodyText'], fontSize=7, wordWrap='LTR', leading=9, leftIndent=0, rightIndent=0)
-                check_cell_style = ParagraphStyle('SubjCheck', parent=self.styles['CustomBodyText'], fontSize=9, alignment=TA_CENTER)
+                subj_cell_style = self.styles['SubjCell']
+                check_cell_style = self.styles['SubjCheck']
                 
                 for subj in subj_list:
                     # Use full text with proper wrapping instead of truncation
-                    row = [Paragraph(subj, subj_cell_style)]
+                    row = [Paragraph(escape(subj), subj_cell_style)]
                     for provider in providers_data[:5]:
                         provider_name = provider.get("name", "Unknown")
                         has_subj = subj in provider_subj_map.get(provider_name, set())
@@ -1380,7 +1965,7 @@ class PDFGeneratorService:
                     subj_table_data.append(row)
                 
                 if len(subj_table_data) > 1:
-                    available_width = self.page_width - 1.5*inch
+                    available_width = self._content_width
                     num_providers = len(subj_table_data[0]) - 1
                     # Allocate more width to subjectivity column for better readability
                     subj_col_width = available_width * 0.50
@@ -1389,7 +1974,7 @@ class PDFGeneratorService:
                     
                     subj_table = Table(subj_table_data, colWidths=col_widths, repeatRows=0)
                     subj_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), HexColor('#4A7C2A')),
+                        ('BACKGROUND', (0, 0), (-1, 0), _MEDIUM_GREEN),
                         ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
                         ('ALIGN', (0, 0), (0, -1), 'LEFT'),
                         ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
@@ -1404,262 +1989,145 @@ class PDFGeneratorService:
                         ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
                         ('LEFTPADDING', (0, 0), (-1, -1), 4),
                         ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-                        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#F5F5F5')]),
+                        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, _ALT_ROW_GREY]),
                     ]))
-                    story.append(subj_table)
-                    story.append(Spacer(1, 0.15*inch))
+                    yield subj_table
+                    yield Spacer(1, 0.15*inch)
         
         # 2. Risk Assessment & Exclusions
-        story.append(Paragraph("2. Risk Assessment & Exclusions", self.styles['SubsectionHeading']))
-        story.append(Spacer(1, 0.1*inch))
-        
-        risk_analysis = """
-        Understanding policy exclusions is critical for risk management. The following analysis 
-        highlights unique exclusions that may impact coverage in specific scenarios.
-        """
-        story.append(Paragraph(risk_analysis, self.styles['CustomBodyText']))
-        story.append(Spacer(1, 0.1*inch))
-        
-        # Get providers with exclusion data
-        providers_data = side_by_side.get("providers", []) if side_by_side else []
-        
         if providers_data:
+            yield Paragraph("2. Risk Assessment & Exclusions", self.styles['SubsectionHeading'])
+            yield Spacer(1, 0.1*inch)
+            
+            risk_analysis = """
+            Understanding policy exclusions is critical for risk management. The following analysis 
+            highlights unique exclusions that may impact coverage in specific scenarios.
+            """
+            yield Paragraph(risk_analysis, self.styles['CustomBodyText'])
+            yield Spacer(1, 0.1*inch)
+            
+            # Get providers with exclusion data
+            company_style = self.styles['CompanyName']
+            body_style = self._body_style
             for provider in providers_data[:3]:  # Top 3 for detailed analysis
                 provider_name = provider.get("name", "Unknown")
                 exclusions = provider.get("exclusions", [])
                 
                 if exclusions:
-                    story.append(Paragraph(f"<b>{provider_name}</b>", self.styles['CompanyName']))
+                    yield Paragraph(f"<b>{escape(str(provider_name))}</b>", company_style)
                     
-                    exclusion_count = 0
-                    for exclusion in exclusions:
-                        exclusion_text = str(exclusion) if isinstance(exclusion, str) else exclusion.get("text", str(exclusion))
-                        if self._is_valid_item_text(exclusion_text):
-                            story.append(Paragraph(f"• {exclusion_text}", self.styles['CustomBodyText']))
-                            exclusion_count += 1
-                    
-                    if exclusion_count == 0:
-                        story.append(Paragraph("• Standard exclusions apply", self.styles['CustomBodyText']))
+                    # All valid exclusions as one <br/>-joined paragraph
+                    bullets = [_BULLET + escape(text) for text in map(_as_text, exclusions) if self._is_valid_item_text(text)]
+                    if bullets:
+                        yield Paragraph("<br/>".join(bullets), body_style)
+                    else:
+                        yield Paragraph(_BULLET + "Standard exclusions apply", body_style)
                     
-                    story.append(Spacer(1, 0.1*inch))
-        
-        # Technical Recommendation for Risk Assessment
-        tech_rec_style = ParagraphStyle('TechRec', parent=self.styles['CustomBodyText'], 
-                                       fontSize=9, textColor=HexColor('#2D5016'), 
-                                       leftIndent=0.2*inch, spaceAfter=6)
-        story.append(Paragraph("<b>✓ Technical Recommendation:</b> Cross-reference exclusions with operational risks. "
-                             "Engage legal counsel to review cyber, terrorism, and catastrophe exclusions. "
-                             "Consider standalone policies for excluded high-risk areas.",
-                             tech_rec_style))
-        story.append(Spacer(1, 0.15*inch))
+                    yield Spacer(1, 0.1*inch)
+            
+            # Technical Recommendation for Risk Assessment
+            tech_rec_style = self.styles['TechRec']
+            yield Paragraph("<b>✓ Technical Recommendation:</b> Cross-reference exclusions with operational risks. "
+                                 "Engage legal counsel to review cyber, terrorism, and catastrophe exclusions. "
+                                 "Consider standalone policies for excluded high-risk areas.",
+                                 tech_rec_style)
+            yield Spacer(1, 0.15*inch)
         
         # 3. Benefits per Provider (text only, no tables)
-        story.append(Paragraph("3. Benefits Comparison per Provider", self.styles['SubsectionHeading']))
-        story.append(Spacer(1, 0.1*inch))
+        yield Paragraph("3. Benefits Comparison per Provider", self.styles['SubsectionHeading'])
+        yield Spacer(1, 0.1*inch)
         
         # Try to get benefits from multiple sources
         benefits_found = False
+        benefits_index = None
+        quote_benefits = None
         
         # First, try from data_table rows
-        if rows:
-            for row in rows[:5]:  # Top 5 providers
-                if isinstance(row, dict):
-                    provider_name = row.get("provider_name") or row.get("provider") or row.get("company") or "N/A"
-                    
-                    # Get benefits list - try multiple keys
-                    benefits_list = None
-                    if "benefits" in row:
-                        benefits_val = row.get("benefits")
-                        if isinstance(benefits_val, list):
-                            benefits_list = benefits_val
-                        elif isinstance(benefits_val, (int, float)):
-                            # If it's a number, skip - we need the actual list
-                            continue
-                    
-                    # If not found in benefits, try from extracted_quotes or side_by_side
-                    if not benefits_list or len(benefits_list) == 0:
-                        # Try to find provider in side_by_side data
-                        if side_by_side and side_by_side.get("providers"):
-                            for provider in side_by_side.get("providers", []):
-                                if provider.get("name") == provider_name or provider.get("company") == provider_name:
-                                    benefits_list = provider.get("benefits", [])
-                                    if isinstance(benefits_list, list) and len(benefits_list) > 0:
-                                        break
+        if provider_rows:
+            for row in provider_rows[:5]:  # Top 5 providers
+                provider_name = row.name
+                
+                # Get benefits list - try multiple keys
+                benefits_list = None
+                benefits_val = row.benefits
+                if isinstance(benefits_val, list):
+                    benefits_list = benefits_val
+                elif isinstance(benefits_val, (int, float)):
+                    # If it's a number, skip - we need the actual list
+                    continue
+                
+                # If not found in benefits, try from side_by_side or extracted_quotes
+                if not benefits_list:
+                    # Index the fallback sources once, only when a row actually needs them
+                    if benefits_index is None:
+                        benefits_index, quote_benefits = self._build_benefits_index(
+                            providers_data,
+                            extracted_quotes or []
+                        )
                     
-                    # If still not found, try from extracted_quotes in comparison_data
-                    if (not benefits_list or len(benefits_list) == 0) and comparison_data.get("extracted_quotes"):
-                        for quote in comparison_data.get("extracted_quotes", []):
-                            quote_company = quote.get("company") or quote.get("insurer_name") or quote.get("provider_name")
-                            if quote_company and (quote_company in provider_name or provider_name in quote_company):
-                                benefits_list = quote.get("benefits", [])
-                                if isinstance(benefits_list, list) and len(benefits_list) > 0:
-                                    break
+                    # Try to find provider in side_by_side data (exact name/company match)
+                    benefits_list = benefits_index.get(provider_name)
                     
-                    # Display benefits if found - LIST ALL BENEFITS (no limit)
-                    if benefits_list and isinstance(benefits_list, list) and len(benefits_list) > 0:
-                        benefits_found = True
-                        story.append(Paragraph(f"<b>{provider_name}</b>", self.styles['CompanyName']))
-                        story.append(Spacer(1, 0.05*inch))
-                        
-                        # Display ALL benefits - no truncation
-                        benefits_text = []
-                        for benefit in benefits_list:  # Show ALL benefits, no limit
-                            benefit_text = str(benefit) if isinstance(benefit, str) else benefit.get("text", str(benefit))
-                            if self._is_valid_item_text(benefit_text):
-                                benefits_text.append(f"• {benefit_text}")
-                        
-                        if benefits_text:
-                            # Create a compact paragraph style for benefits
-                            benefits_style = ParagraphStyle(
-                                'BenefitsText',
-                                parent=self.styles['CustomBodyText'],
-                                fontSize=8,
-                                spaceAfter=3,
-                                leftIndent=0.2*inch,
-                                bulletIndent=0.2*inch
-                            )
-                            
-                            # Display all benefits
-                            for benefit_item in benefits_text:
-                                story.append(Paragraph(benefit_item, benefits_style))
-                            
-                            # Show total count at the end
-                            total_benefits = len(benefits_text)
-                            story.append(Paragraph(
-                                f"<i>(Total: {total_benefits} benefits)</i>",
-                                ParagraphStyle('TotalBenefits', parent=self.styles['CustomBodyText'], 
-                                              fontSize=7, textColor=colors.grey, leftIndent=0.2*inch, spaceBefore=4)
-                            ))
-                        else:
-                            story.append(Paragraph("• Standard benefits apply", self.styles['CustomBodyText']))
-                        
-                        story.append(Spacer(1, 0.1*inch))
+                    # If still not found, try from extracted_quotes (substring match either way)
+                    if not benefits_list:
+                        for quote_company, quote_benefits_list in quote_benefits:
+                            if quote_company in provider_name or provider_name in quote_company:
+                                benefits_list = quote_benefits_list
+                                break
+                
+                # Display benefits if found - LIST ALL BENEFITS (no limit)
+                if benefits_list and isinstance(benefits_list, list):
+                    benefits_found = True
+                    yield self._build_benefits_block(row.safe_name, benefits_list, show_fallback=True)
+                    yield Spacer(1, 0.1*inch)
         
         # If no benefits found from rows, try side_by_side providers directly
-        if not benefits_found and side_by_side and side_by_side.get("providers"):
-            for provider in side_by_side.get("providers", [])[:5]:
+        if not benefits_found and providers_data:
+            for provider in providers_data[:5]:
                 provider_name = provider.get("name") or provider.get("company") or "Unknown"
                 benefits_list = provider.get("benefits", [])
                 
-                if benefits_list and isinstance(benefits_list, list) and len(benefits_list) > 0:
+                if benefits_list and isinstance(benefits_list, list):
                     benefits_found = True
-                    story.append(Paragraph(f"<b>{provider_name}</b>", self.styles['CompanyName']))
-                    story.append(Spacer(1, 0.05*inch))
-                    
-                    # Display ALL benefits - no truncation
-                    benefits_text = []
-                    for benefit in benefits_list:  # Show ALL benefits, no limit
-                        benefit_text = str(benefit) if isinstance(benefit, str) else benefit.get("text", str(benefit))
-                        if self._is_valid_item_text(benefit_text):
-                            benefits_text.append(f"• {benefit_text}")
-                    
-                    if benefits_text:
-                        benefits_style = ParagraphStyle(
-                            'BenefitsText',
-                            parent=self.styles['CustomBodyText'],
-                            fontSize=8,
-                            spaceAfter=3,
-                            leftIndent=0.2*inch,
-                            bulletIndent=0.2*inch
-                        )
-                        
-                        # Display all benefits
-                        for benefit_item in benefits_text:
-                            story.append(Paragraph(benefit_item, benefits_style))
-                        
-                        # Show total count at the end
-                        total_benefits = len(benefits_text)
-                        story.append(Paragraph(
-                            f"<i>(Total: {total_benefits} benefits)</i>",
-                            ParagraphStyle('TotalBenefits', parent=self.styles['CustomBodyText'], 
-                                          fontSize=7, textColor=colors.grey, leftIndent=0.2*inch, spaceBefore=4)
-                        ))
-                    
-                    story.append(Spacer(1, 0.1*inch))
+                    yield self._build_benefits_block(escape(str(provider_name)), benefits_list, show_fallback=False)
+                    yield Spacer(1, 0.1*inch)
         
         # If still no benefits found, show a message
         if not benefits_found:
-            story.append(Paragraph(
+            yield Paragraph(
                 "Benefits information is being processed. Please refer to the detailed data table for benefit counts.",
                 self.styles['CustomBodyText']
-            ))
+            )
         
-        story.append(Spacer(1, 0.15*inch))
+        yield Spacer(1, 0.15*inch)
         
         # Final Technical Recommendation (moved here, removed Key Insights section)
-        story.append(Paragraph("Final Technical Recommendation", self.styles['SubsectionHeading']))
-        story.append(Spacer(1, 0.08*inch))
+        yield Paragraph("Final Technical Recommendation", self.styles['SubsectionHeading'])
+        yield Spacer(1, 0.08*inch)
         
         # Get recommendation from comparison data
-        key_differences = comparison_data.get("key_differences", {})
         recommendation = key_differences.get("recommendation", "")
         recommendation_reasoning = key_differences.get("recommendation_reasoning", "")
         
         if recommendation and recommendation_reasoning:
             # Remove any sum insured/coverage limit mentions from reasoning (comprehensive removal)
-            clean_reasoning = recommendation_reasoning
-            
-            # CRITICAL FIX: Clarify premium comparisons - fix confusing sentence structure
-            # Fix pattern: "and a [low/competitive] rate of X, significantly lower than Provider's SAR Y"
-            # Replace with: "with a [low/competitive] rate of X, compared to Provider's premium of SAR Y"
-            def fix_premium_comparison_detailed(match):
-                rate_adj = match.group(2) + ' ' if match.group(2) else ''
-                rate_type = match.group(3)
-                rate_val = match.group(4)
-                provider = match.group(6)
-                premium_val = match.group(7)
-                return f"with {rate_adj}{rate_type} of {rate_val}, compared to {provider}'s premium of SAR {premium_val}"
-            
-            clean_reasoning = re.sub(
-                r'\band\s+(a|an)?\s*(low|high|competitive)?\s*(rate|premium)\s+of\s+([^,]+),\s+significantly\s+(lower|higher)\s+than\s+([A-Za-z\s\']+?)\'s\s+SAR\s+([\d,]+\.?\d*)',
-                fix_premium_comparison_detailed,
-                clean_reasoning,
-                flags=re.IGNORECASE
-            )
-            # More general fix: "significantly lower than Provider's SAR X" -> "compared to Provider's premium of SAR X"
-            clean_reasoning = re.sub(
-                r'\b(significantly|substantially)\s+(lower|higher)\s+than\s+([A-Za-z\s\']+?)\'s\s+SAR\s+([\d,]+\.?\d*)',
-                r'compared to \3\'s premium of SAR \4',
-                clean_reasoning,
-                flags=re.IGNORECASE
-            )
-            # Fix: "Provider's SAR X" -> "Provider's premium of SAR X" (when not already "premium of")
-            clean_reasoning = re.sub(
-                r'\b([A-Za-z\s\']+?)\'s\s+(?!premium\s+of\s+SAR)SAR\s+([\d,]+\.?\d*)(?=\s|\.|,|$)',
-                r'\1\'s premium of SAR \2',
-                clean_reasoning,
-                flags=re.IGNORECASE
-            )
-            
-            # Remove explicit sum insured and coverage limit mentions
-            clean_reasoning = re.sub(r'\b(sum insured|Sum Insured|coverage limit|Coverage Limit|substantial coverage limit|total sum insured)\b[^.]*\.?', '', clean_reasoning, flags=re.IGNORECASE)
-            # Remove phrases with large numbers + billion/million (e.g., "offers a high 56 billion")
-            clean_reasoning = re.sub(r'\b(offers?|with|of|has)\s+(a|an)?\s*(high|total|maximum)?\s*[\d,]+\.?\d*\s*(billion|million)\b', '', clean_reasoning, flags=re.IGNORECASE)
-            # Remove standalone large numbers with billion/million (only very large numbers to avoid removing premiums)
-            clean_reasoning = re.sub(r'\b[\d,]{4,}\.?\d*\s*(billion|million)\b', '', clean_reasoning, flags=re.IGNORECASE)
-            # Remove SAR values with very large numbers (likely sum insured)
-            clean_reasoning = re.sub(r'\b(SAR|SR)\s*[\d,]{9,}\b', '', clean_reasoning, flags=re.IGNORECASE)
-            # Clean up whitespace and punctuation
-            clean_reasoning = re.sub(r'\s+', ' ', clean_reasoning).strip()
-            clean_reasoning = re.sub(r'\s*,\s*,', ',', clean_reasoning)  # Remove double commas
-            clean_reasoning = re.sub(r'\s*\.\s*\.', '.', clean_reasoning)  # Remove double periods
+            # Same clean-up as the strategic memo: clarify premium comparisons, drop sum insured mentions
+            clean_reasoning = _clean_recommendation_reasoning(recommendation_reasoning)
             
             final_rec_text = f"""
             Based on comprehensive analysis of coverage quality, pricing competitiveness, policy terms, and 
-            risk assessment, we recommend <b>{recommendation}</b>. {clean_reasoning}
+            risk assessment, we recommend <b>{escape(str(recommendation))}</b>. {escape(clean_reasoning)}
             
             This recommendation considers the optimal balance between coverage adequacy, premium efficiency, 
             and favorable policy conditions including subjectivities, exclusions, and deductibles.
             """
         else:
             # Fallback recommendation based on ranking
-            summary = comparison_data.get("summary", {})
-            ranking = summary.get("ranking", [])
-            if ranking and len(ranking) > 0:
+            if ranking:
                 top_provider = ranking[0].get("company", "the top-ranked provider")
                 final_rec_text = f"""
                 Based on comprehensive analysis of coverage quality, pricing competitiveness, policy terms, and 
-                risk assessment, we recommend <b>{top_provider}</b> as the optimal choice. This provider offers 
+                risk assessment, we recommend <b>{escape(str(top_provider))}</b> as the optimal choice. This provider offers 
                 the best balance between coverage adequacy, premium efficiency, and favorable policy conditions 
                 including subjectivities, exclusions, and deductibles.
                 """
@@ -1670,34 +2138,22 @@ class PDFGeneratorService:
                 exclusions, and deductibles. Please review the detailed comparison tables above for specific metrics.
                 """
         
-        final_rec_style = ParagraphStyle(
-            'FinalRecommendation',
-            parent=self.styles['CustomBodyText'],
-            fontSize=10,
-            textColor=HexColor('#2D5016'),
-            spaceAfter=8,
-            alignment=TA_JUSTIFY,
-            leftIndent=0.2*inch,
-            rightIndent=0.2*inch
-        )
-        story.append(Paragraph(final_rec_text, final_rec_style))
-        story.append(Spacer(1, 0.15*inch))
-        
-        return story
+        final_rec_style = self.styles['FinalRecommendation']
+        yield Paragraph(final_rec_text, final_rec_style)
+        yield Spacer(1, 0.15*inch)
     
-    def _build_summary_section(self, comparison_data: Dict[str, Any]) -> List:
+    def _build_summary_section(self, view: _ComparisonView) -> Iterator:
         """Build summary section with ranking and overview."""
-        story = []
         
         # Section title
         title = Paragraph("Executive Summary", self.styles['SectionHeading'])
-        story.append(title)
-        story.append(Spacer(1, 0.15*inch))
+        yield title
+        yield Spacer(1, 0.15*inch)
         
-        summary = comparison_data.get("summary", {})
+        summary = view.summary
         if not summary:
-            story.append(Paragraph("No summary data available.", self.styles['CustomBodyText']))
-            return story
+            yield Paragraph("No summary data available.", self.styles['CustomBodyText'])
+            return
         
         # Analysis summary
         if summary.get("analysis_summary"):
@@ -1705,35 +2161,29 @@ class PDFGeneratorService:
                 f"<b>Overview:</b><br/>{summary.get('analysis_summary', '')}",
                 self.styles['CustomBodyText']
             )
-            story.append(summary_text)
-            story.append(Spacer(1, 0.15*inch))
+            yield summary_text
+            yield Spacer(1, 0.15*inch)
         
         # Ranking table
-        ranking = summary.get("ranking", [])
-        if ranking and len(ranking) > 0:
-            story.append(Paragraph("Provider Rankings", self.styles['SubsectionHeading']))
+        ranking = view.ranking
+        if ranking:
+            yield Paragraph("Provider Rankings", self.styles['SubsectionHeading'])
             
             # Prepare ranking table data - improved format (NO HAKIM SCORE)
             table_data = [["Rank", "Provider", "Score", "Premium (SAR)", "Rate"]]
+            body_style = self._body_style
             
-            for item in ranking[:10]:  # Limit to top 10
-                if not isinstance(item, dict):
-                    continue  # Skip invalid items
-                
+            for item in self._normalize_ranking(ranking, 10):  # Limit to top 10
                 try:
-                    rank = str(item.get("rank", ""))
-                    company = item.get("company", "N/A")
-                    score_val = item.get('score', 0)
-                    score = f"{float(score_val):.1f}" if score_val else "0.0"
-                    premium_val = item.get('premium', 0)
-                    premium = f"{float(premium_val):,.2f}" if premium_val else "0.00"
-                    rate = item.get("rate", "N/A")
+                    rank = "" if item.rank is None else str(item.rank)
+                    score = _format_or_default(item.score, _FMT_1F, "0.0")
+                    premium = _format_or_default(item.premium, _FMT_2F, "0.00")
                     
                     # CRITICAL FIX: Wrap provider name in Paragraph for text wrapping
-                    company_paragraph = Paragraph(company, self.styles['CustomBodyText'])
-                    table_data.append([rank, company_paragraph, score, premium, rate])
+                    company_paragraph = Paragraph(escape(str(item.company)), body_style)
+                    table_data.append([rank, company_paragraph, score, premium, item.rate])
                 except (ValueError, TypeError) as e:
-                    logger.warning(f"⚠️  Error processing ranking item: {e}")
+                    logger.warning("⚠️  Error processing ranking item: %s", e)
                     continue
             
             # Only create table if we have data rows (more than just header)
@@ -1741,94 +2191,79 @@ class PDFGeneratorService:
                 # Adjusted column widths to fit margins (removed Hakim Score column)
                 ranking_table = Table(table_data, colWidths=[0.6*inch, 2.2*inch, 0.9*inch, 1.3*inch, 0.9*inch])
                 
-                # Build table style
-                table_style = [
-                    ('BACKGROUND', (0, 0), (-1, 0), HexColor('#4A7C2A')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (0, -1), 'LEFT'),  # Provider name left-aligned
-                    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),  # Other columns center
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('WORDWRAP', (0, 0), (-1, -1), True),  # CRITICAL FIX: Enable word wrap
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-                    ('TOPPADDING', (0, 0), (-1, 0), 10),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 9),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ]
-                
                 # Only add ROWBACKGROUNDS if we have data rows (more than just header)
-                if len(table_data) > 2:
-                    table_style.append(('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#F5F5F5')]))
-                
-                ranking_table.setStyle(TableStyle(table_style))
-                story.append(ranking_table)
-                story.append(Spacer(1, 0.15*inch))
+                ranking_table.setStyle(self._ranking_table_styles[len(table_data) > 2])
+                yield ranking_table
+                yield Spacer(1, 0.15*inch)
             else:
-                story.append(Paragraph("No ranking data available.", self.styles['CustomBodyText']))
+                yield Paragraph("No ranking data available.", self.styles['CustomBodyText'])
         
         # Best overall and best value
         if summary.get("best_overall") or summary.get("best_value"):
             recommendations = []
             if summary.get("best_overall"):
-                recommendations.append(f"<b>Best Overall:</b> {summary.get('best_overall', 'N/A')}")
+                recommendations.append(f"<b>Best Overall:</b> {escape(str(summary['best_overall']))}")
             if summary.get("best_value"):
-                recommendations.append(f"<b>Best Value:</b> {summary.get('best_value', 'N/A')}")
+                recommendations.append(f"<b>Best Value:</b> {escape(str(summary['best_value']))}")
             
             if recommendations:
                 rec_text = Paragraph("<br/>".join(recommendations), self.styles['CustomBodyText'])
-                story.append(rec_text)
-        
-        return story
+                yield rec_text
+    
+    def _build_item_list(self, label: str, items: List[Any], empty_text: str, space_after: float) -> Tuple:
+        """Build a labelled bullet list (warranties/exclusions/subjectivities) as one joined paragraph."""
+        # CRITICAL FIX: Skip truncated, incomplete, or placeholder text - NO LIMIT on valid items
+        valid = [text for text in map(_as_text, items) if self._is_valid_item_text(text)]
+        body_style = self._body_style
+        if valid:
+            bullets = Paragraph("<br/>".join(_BULLET + escape(text) for text in valid), body_style)
+        else:
+            bullets = Paragraph(_BULLET + empty_text, body_style)
+        return (Paragraph(f"<b>{label}:</b>", body_style), bullets, Spacer(1, space_after*inch))
     
-    def _build_key_differences_section(self, comparison_data: Dict[str, Any]) -> List:
+    def _build_key_differences_section(self, view: _ComparisonView) -> Iterator:
         """Build key differences section with all warranties, exclusions, subjectivities per provider."""
-        story = []
         
         title = Paragraph("Key Differences", self.styles['SectionHeading'])
-        story.append(title)
-        story.append(Spacer(1, 0.15*inch))
+        yield title
+        yield Spacer(1, 0.15*inch)
         
-        key_differences = comparison_data.get("key_differences", {})
-        side_by_side = comparison_data.get("side_by_side", {})
+        key_differences = view.key_differences
         
         # Recommendation with detailed reasoning
         if key_differences.get("recommendation"):
             rec_text = Paragraph(
-                f"<b>Recommendation:</b> {key_differences.get('recommendation', '')}",
+                f"<b>Recommendation:</b> {escape(str(key_differences['recommendation']))}",
                 self.styles['Highlight']
             )
-            story.append(rec_text)
-            story.append(Spacer(1, 0.1*inch))
+            yield rec_text
+            yield Spacer(1, 0.1*inch)
             
             # Add detailed reasoning if available
             if key_differences.get("recommendation_reasoning"):
                 reasoning_text = Paragraph(
-                    f"<b>Why this is the best choice:</b> {key_differences.get('recommendation_reasoning', '')}",
+                    f"<b>Why this is the best choice:</b> {escape(str(key_differences['recommendation_reasoning']))}",
                     self.styles['CustomBodyText']
                 )
-                story.append(reasoning_text)
+                yield reasoning_text
             
-            story.append(Spacer(1, 0.2*inch))
+            yield Spacer(1, 0.2*inch)
         
         # Get provider details from side_by_side or summary
         providers_data = []
-        if side_by_side and side_by_side.get("providers"):
-            providers_data = side_by_side.get("providers", [])
-        elif comparison_data.get("summary") and comparison_data.get("summary", {}).get("ranking"):
+        if view.providers:
+            providers_data = view.providers
+        elif view.ranking:
             # Extract from ranking
-            ranking = comparison_data.get("summary", {}).get("ranking", [])
-            for item in ranking:
-                if isinstance(item, dict):
-                    providers_data.append({
-                        "name": item.get("company", "Unknown"),
-                        "warranties": item.get("warranties", []),
-                        "exclusions": item.get("exclusions", []),
-                        "subjectivities": item.get("subjectivities", [])
-                    })
+            providers_data = [
+                {
+                    "name": item.get("company", "Unknown"),
+                    "warranties": item.get("warranties", []),
+                    "exclusions": item.get("exclusions", []),
+                    "subjectivities": item.get("subjectivities", [])
+                }
+                for item in view.ranking
+            ]
         
         # Show unique warranties, exclusions, subjectivities per provider
         if providers_data:
@@ -1836,161 +2271,146 @@ class PDFGeneratorService:
                 provider_name = provider.get("name", "Unknown")
                 
                 # Provider header
-                provider_header = Paragraph(f"<b>{provider_name}</b>", self.styles['SubsectionHeading'])
-                story.append(provider_header)
-                story.append(Spacer(1, 0.1*inch))
+                provider_header = Paragraph(f"<b>{escape(str(provider_name))}</b>", self.styles['SubsectionHeading'])
+                block = (provider_header, Spacer(1, 0.1*inch))
                 
                 # Unique Warranties - SHOW ALL (filtered for quality)
                 warranties = provider.get("warranties", []) or provider.get("unique_warranties", [])
                 if warranties:
-                    story.append(Paragraph("<b>Unique Warranties:</b>", self.styles['CustomBodyText']))
-                    displayed_count = 0
-                    for warranty in warranties:  # NO LIMIT - show all valid items
-                        warranty_text = str(warranty) if isinstance(warranty, str) else warranty.get("text", str(warranty))
-                        # CRITICAL FIX: Skip truncated, incomplete, or placeholder text
-                        if self._is_valid_item_text(warranty_text):
-                            story.append(Paragraph(f"• {warranty_text}", self.styles['CustomBodyText']))
-                            displayed_count += 1
-                    if displayed_count == 0:
-                        story.append(Paragraph("• No unique warranties identified", self.styles['CustomBodyText']))
-                    story.append(Spacer(1, 0.1*inch))
+                    block += self._build_item_list("Unique Warranties", warranties, "No unique warranties identified", 0.1)
                 
                 # Unique Exclusions - SHOW ALL (filtered for quality)
                 exclusions = provider.get("exclusions", []) or provider.get("unique_exclusions", [])
                 if exclusions:
-                    story.append(Paragraph("<b>Unique Exclusions:</b>", self.styles['CustomBodyText']))
-                    displayed_count = 0
-                    for exclusion in exclusions:  # NO LIMIT - show all valid items
-                        exclusion_text = str(exclusion) if isinstance(exclusion, str) else exclusion.get("text", str(exclusion))
-                        # CRITICAL FIX: Skip truncated, incomplete, or placeholder text
-                        if self._is_valid_item_text(exclusion_text):
-                            story.append(Paragraph(f"• {exclusion_text}", self.styles['CustomBodyText']))
-                            displayed_count += 1
-                    if displayed_count == 0:
-                        story.append(Paragraph("• No unique exclusions identified", self.styles['CustomBodyText']))
-                    story.append(Spacer(1, 0.1*inch))
+                    block += self._build_item_list("Unique Exclusions", exclusions, "No unique exclusions identified", 0.1)
                 
                 # Unique Subjectivities - SHOW ALL (filtered for quality)
                 subjectivities = provider.get("subjectivities", []) or provider.get("unique_subjectivities", [])
                 if subjectivities:
-                    story.append(Paragraph("<b>Unique Subjectivities:</b>", self.styles['CustomBodyText']))
-                    displayed_count = 0
-                    for subjectivity in subjectivities:  # NO LIMIT - show all valid items
-                        subj_text = str(subjectivity) if isinstance(subjectivity, str) else subjectivity.get("text", str(subjectivity))
-                        # CRITICAL FIX: Skip truncated, incomplete, or placeholder text
-                        if self._is_valid_item_text(subj_text):
-                            story.append(Paragraph(f"• {subj_text}", self.styles['CustomBodyText']))
-                            displayed_count += 1
-                    if displayed_count == 0:
-                        story.append(Paragraph("• No unique subjectivities identified", self.styles['CustomBodyText']))
-                    story.append(Spacer(1, 0.15*inch))
+                    block += self._build_item_list("Unique Subjectivities", subjectivities, "No unique subjectivities identified", 0.15)
+                
+                # Hand the provider's whole block over at once
+                yield from block
         
         # Price differences table (if available)
         differences = key_differences.get("differences", [])
         if differences:
-            story.append(Paragraph("Price Differences", self.styles['SubsectionHeading']))
-            story.append(Spacer(1, 0.1*inch))
+            yield Paragraph("Price Differences", self.styles['SubsectionHeading'])
+            yield Spacer(1, 0.1*inch)
             
             # CRITICAL FIX: Use actual company names from first difference, not hardcoded "Provider 1/2"
-            first_diff = differences[0] if differences else {}
+            first_diff = differences[0]
             header1 = first_diff.get("provider1", "Insurer 1")
             header2 = first_diff.get("provider2", "Insurer 2")
             
-            # CRITICAL FIX: Create dedicated header style for text wrapping
-            from reportlab.lib.styles import ParagraphStyle
-            header_style = ParagraphStyle(
-                'PriceDiffHeader',
-                parent=self.styles['CustomBodyText'],
-                fontSize=8,
-                leading=10,
-                textColor=colors.whitesmoke,
-                fontName='Helvetica-Bold',
-                alignment=0,  # Left alignment
-                wordWrap='LTR',
-                splitLongWords=True
-            )
+            # CRITICAL FIX: Dedicated header style for text wrapping
+            header_style = self._styles_cache['price_diff_header']
             
             # CRITICAL FIX: Wrap ALL header cells in Paragraphs to enable text wrapping
-            header1_para = Paragraph(header1, header_style)
-            header2_para = Paragraph(header2, header_style)
+            header1_para = Paragraph(escape(str(header1)), header_style)
+            header2_para = Paragraph(escape(str(header2)), header_style)
             header3_para = Paragraph("Price Difference (SAR)", header_style)
             header4_para = Paragraph("Difference %", header_style)
             
             table_data = [[header1_para, header2_para, header3_para, header4_para]]
             
-            # Create body cell style
-            body_style = ParagraphStyle(
-                'PriceDiffBody',
-                parent=self.styles['CustomBodyText'],
-                fontSize=7,
-                leading=9,
-                alignment=0,  # Left alignment
-                wordWrap='LTR',
-                splitLongWords=True
-            )
+            # Body cell style
+            body_style = self._styles_cache['price_diff_body']
+            name_width = self._diff_col_widths[0]
             
             for diff in differences[:10]:  # Limit to 10 differences
                 provider1 = diff.get("provider1", "N/A")
                 provider2 = diff.get("provider2", "N/A")
-                price_diff = f"{diff.get('price_difference', 0):,.2f}"
-                diff_pct = f"{diff.get('price_difference_percentage', 0):.2f}%"  # Direct % symbol
+                price_diff = _FMT_2F(diff.get('price_difference', 0))
+                diff_pct = _FMT_PCT_2F(diff.get('price_difference_percentage', 0))
                 
-                # CRITICAL FIX: Wrap provider names in Paragraph for text wrapping
-                provider1_para = Paragraph(provider1, body_style)
-                provider2_para = Paragraph(provider2, body_style)
+                # CRITICAL FIX: Wrap provider names in Paragraph for text wrapping (when they need it)
+                provider1_para = self._fit_cell(provider1, body_style, name_width, 8)
+                provider2_para = self._fit_cell(provider2, body_style, name_width, 8)
                 
                 table_data.append([provider1_para, provider2_para, price_diff, diff_pct])
             
-            # Ensure table fits within margins
-            available_width = self.page_width - 1.5*inch
-            col_widths = [available_width * 0.3, available_width * 0.3, available_width * 0.2, available_width * 0.2]
-            
             # CRITICAL FIX: Set rowHeights=None for dynamic row expansion
-            diff_table = Table(table_data, colWidths=col_widths, rowHeights=None)
-            diff_style = [
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#4A7C2A')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (1, -1), 'LEFT'),  # Provider columns left-aligned
-                ('ALIGN', (2, 0), (-1, -1), 'CENTER'),  # Price/% columns center
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # CRITICAL FIX: TOP alignment prevents overlap
-                ('WORDWRAP', (0, 0), (-1, -1), True),  # CRITICAL FIX: Enable word wrap
-                # FONTNAME and FONTSIZE removed for header since it's now in Paragraph style
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),  # Increased padding for header
-                ('TOPPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 7),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 6),  # Padding for data rows
-                ('TOPPADDING', (0, 1), (-1, -1), 6),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('LEFTPADDING', (0, 0), (-1, -1), 4),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-            ]
-            if len(table_data) > 2:
-                diff_style.append(('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#F5F5F5')]))
-            diff_table.setStyle(TableStyle(diff_style))
-            story.append(diff_table)
+            diff_table = Table(table_data, colWidths=list(self._diff_col_widths), rowHeights=None)
+            # Row backgrounds only alternate once there is more than one data row
+            diff_table.setStyle(self._diff_table_styles[len(table_data) > 2])
+            yield diff_table
+    
+    def _first(self, d: Dict[str, Any], keys: Tuple[str, ...], default: Any, skip_falsy: bool = False) -> Any:
+        """
+        Return the value of the first key present in d.
         
-        return story
+        Missing/None and empty-string values fall through to the next key, but 0 is a real
+        value - a zero score or premium no longer gets replaced by a fallback key. With
+        skip_falsy, every falsy value (including 0) falls through, like an `or` chain.
+        """
+        for key in keys:
+            value = d.get(key)
+            if skip_falsy:
+                if value:
+                    return value
+            elif value is not None and value != "":
+                return value
+        return default
+    
+    def _extract_coverage(self, row: Dict[str, Any]) -> Any:
+        """Coverage cell value; strings like "SR 1,564,652,306" are reduced to their largest number."""
+        # A zero coverage is not a real limit: fall through to coverage_limit, as the UI does
+        coverage_val = self._first(row, self._DATA_TABLE_KEYS["coverage"], 0, skip_falsy=True)
+        if not isinstance(coverage_val, str):
+            return coverage_val
+        # Try to extract numeric value from string
+        numbers = _CURRENCY_RE.findall(coverage_val.translate(_WS_TABLE))
+        if not numbers:
+            return 0
+        # Take the largest number found
+        largest = max(numbers, key=lambda x: len(x.replace(",", "")))
+        return largest.replace(",", "")
+    
+    def _count_field(self, row: Dict[str, Any], key: str) -> Any:
+        """Count cell value (COUNT ONLY, not list) from "<key>_count" or the <key> list/number."""
+        count_key = f"{key}_count"
+        if count_key in row:
+            return row.get(count_key) or 0
+        if key in row:
+            val = row.get(key)
+            if isinstance(val, (int, float)):
+                return int(val)
+            if isinstance(val, list):
+                return len(val)
+        return 0
     
-    def _build_data_table_section(self, comparison_data: Dict[str, Any]) -> List:
+    def _setup_cell_extractors(self):
+        """Map each data table UI column to the function that pulls its raw value from a row."""
+        keys = self._DATA_TABLE_KEYS
+        self._cell_extractors = {
+            "provider_name": lambda row: self._first(row, keys["provider_name"], "N/A"),
+            "score": lambda row: self._first(row, keys["score"], 0),
+            "premium": lambda row: self._first(row, keys["premium"], 0),
+            # A zero rate shows "N/A", as in the UI
+            "rate": lambda row: self._first(row, keys["rate"], "N/A", skip_falsy=True),
+            "coverage": self._extract_coverage,
+            "benefits": lambda row: self._count_field(row, "benefits"),
+            "exclusions": lambda row: self._count_field(row, "exclusions"),
+            "warranties": lambda row: self._count_field(row, "warranties"),
+            "rank": lambda row: self._first(row, keys["rank"], 0),
+        }
+    
+    def _build_data_table_section(self, view: _ComparisonView) -> Iterator:
         """Build data table section matching frontend UI format EXACTLY."""
-        story = []
         
         title = Paragraph("Detailed Data Table", self.styles['SectionHeading'])
-        story.append(title)
-        story.append(Spacer(1, 0.15*inch))
+        yield title
+        yield Spacer(1, 0.15*inch)
         
-        data_table = comparison_data.get("data_table", {})
-        if not data_table:
-            story.append(Paragraph("No data table available.", self.styles['CustomBodyText']))
-            return story
+        if not view.data_table:
+            yield Paragraph("No data table available.", self.styles['CustomBodyText'])
+            return
         
-        rows = data_table.get("rows", [])
+        rows = view.rows
         if not rows:
-            story.append(Paragraph("No data rows available.", self.styles['CustomBodyText']))
-            return story
+            yield Paragraph("No data rows available.", self.styles['CustomBodyText'])
+            return
         
         # EXACT UI COLUMNS (in order): Provider name, Score, Premium, Rate, Coverage, Benefits, Exclusions, Warranties, Rank
         ui_columns = [
@@ -2005,531 +2425,193 @@ class PDFGeneratorService:
             ("rank", "Rank")
         ]
         
-        # Build table data with EXACT UI format
-        table_data = []
-        
         # Header row - EXACT UI column names wrapped in Paragraph for proper spacing
-        from reportlab.lib.styles import ParagraphStyle
-        header_style = ParagraphStyle(
-            'TableHeader',
-            parent=self.styles['CustomBodyText'],
-            fontSize=8,
-            leading=10,
-            alignment=1,  # Center alignment
-            textColor=colors.white,
-            fontName='Helvetica-Bold',
-            wordWrap='LTR'
-        )
+        header_style = self._styles_cache['table_header']
         
         # CRITICAL FIX: Wrap each header in Paragraph to prevent text overlap
         header_row = [Paragraph(col_display, header_style) for _, col_display in ui_columns]
-        table_data.append(header_row)
+        table_data = [header_row]  # Table data with EXACT UI format
+        
+        # Resolve each column's extractor once for the whole table, not per cell
+        column_extractors = [(col_key, self._cell_extractors[col_key]) for col_key, _ in ui_columns]
+        format_cell = self._format_ui_table_cell
         
-        # Data rows - extract values in UI order
+        # Data rows - extract values in UI order and format them for display
         for row_idx, row in enumerate(rows):
             try:
                 if not isinstance(row, dict):
                     continue
                 
-                row_data = []
-                for col_key, _ in ui_columns:
-                    # Try multiple key variations
-                    value = None
-                    
-                    # Provider name
-                    if col_key == "provider_name":
-                        value = row.get("provider_name") or row.get("provider") or row.get("company") or row.get("company_name") or "N/A"
-                    
-                    # Score
-                    elif col_key == "score":
-                        value = row.get("score") or row.get("weighted_score") or 0
-                    
-                    # Premium
-                    elif col_key == "premium":
-                        value = row.get("premium") or row.get("premium_amount") or 0
-                    
-                    # Rate
-                    elif col_key == "rate":
-                        value = row.get("rate") or "N/A"
-                    
-                    # Coverage
-                    elif col_key == "coverage":
-                        coverage_val = row.get("coverage") or row.get("coverage_limit") or 0
-                        # If it's a string like "SR 1,564,652,306", extract the number
-                        if isinstance(coverage_val, str):
-                            # Try to extract numeric value from string
-                            numbers = re.findall(r'[\d,]+', coverage_val.replace(" ", ""))
-                            if numbers:
-                                # Take the largest number found
-                                largest = max(numbers, key=lambda x: len(x.replace(",", "")))
-                                value = largest.replace(",", "")
-                            else:
-                                value = 0
-                        else:
-                            value = coverage_val
-                    
-                    # Benefits (COUNT ONLY, not list)
-                    elif col_key == "benefits":
-                        # Get count, not the list
-                        if "benefits_count" in row:
-                            value = row.get("benefits_count") or 0
-                        elif "benefits" in row:
-                            benefits_val = row.get("benefits")
-                            if isinstance(benefits_val, (int, float)):
-                                value = int(benefits_val)
-                            elif isinstance(benefits_val, list):
-                                value = len(benefits_val)
-                            else:
-                                value = 0
-                        else:
-                            value = 0
-                    
-                    # Exclusions (COUNT ONLY, not list)
-                    elif col_key == "exclusions":
-                        # Get count, not the list
-                        if "exclusions_count" in row:
-                            value = row.get("exclusions_count") or 0
-                        elif "exclusions" in row:
-                            exclusions_val = row.get("exclusions")
-                            if isinstance(exclusions_val, (int, float)):
-                                value = int(exclusions_val)
-                            elif isinstance(exclusions_val, list):
-                                value = len(exclusions_val)
-                            else:
-                                value = 0
-                        else:
-                            value = 0
-                    
-                    # Warranties (COUNT ONLY, not list)
-                    elif col_key == "warranties":
-                        # Get count, not the list
-                        if "warranties_count" in row:
-                            value = row.get("warranties_count") or 0
-                        elif "warranties" in row:
-                            warranties_val = row.get("warranties")
-                            if isinstance(warranties_val, (int, float)):
-                                value = int(warranties_val)
-                            elif isinstance(warranties_val, list):
-                                value = len(warranties_val)
-                            else:
-                                value = 0
-                        else:
-                            value = 0
-                    
-                    # Rank
-                    elif col_key == "rank":
-                        value = row.get("rank") or row.get("ranking") or 0
-                    
-                    # Format the value for display
-                    formatted_value = self._format_ui_table_cell(value, col_key)
-                    row_data.append(formatted_value)
-                
-                if len(row_data) == len(ui_columns):
-                    table_data.append(row_data)
+                table_data.append([format_cell(extract(row), col_key) for col_key, extract in column_extractors])
             except Exception as e:
-                logger.warning(f"⚠️  Error processing row {row_idx}: {e}")
+                logger.warning("⚠️  Error processing row %s: %s", row_idx, e)
                 continue
         
         if len(table_data) < 2:
-            story.append(Paragraph("No valid data rows available.", self.styles['CustomBodyText']))
-            return story
-        
-        # Calculate column widths to fit UI proportions - CRITICAL FIX: Wrap text for long provider names
-        available_width = self.page_width - 1.5*inch  # Conservative margins
-        col_widths = [
-            available_width * 0.20,  # Provider name (20%) - will wrap if needed
-            available_width * 0.10,  # Score (10%)
-            available_width * 0.12,  # Premium (12%)
-            available_width * 0.10,  # Rate (10%)
-            available_width * 0.15,  # Coverage (15%)
-            available_width * 0.08,  # Benefits (8%)
-            available_width * 0.08,  # Exclusions (8%)
-            available_width * 0.08,  # Warranties (8%)
-            available_width * 0.09,  # Rank (9%)
-        ]
+            yield Paragraph("No valid data rows available.", self.styles['CustomBodyText'])
+            return
         
-        # CRITICAL FIX: Create smaller paragraph style for table cells
-        from reportlab.lib.styles import ParagraphStyle
-        table_cell_style = ParagraphStyle(
-            'TableCell',
-            parent=self.styles['CustomBodyText'],
-            fontSize=8,
-            leading=10,  # Line height
-            alignment=0,  # Left alignment
-            wordWrap='LTR',
-            splitLongWords=True
-        )
+        # CRITICAL FIX: Smaller paragraph style for table cells
+        table_cell_style = self._styles_cache['table_cell']
         
         # CRITICAL FIX: Wrap provider names in Paragraph for text wrapping
         # Also wrap long numeric values to prevent cell overflow
+        # Cells that fit on one line (8pt body font, 4pt side padding) are drawn without paragraph layout
+        name_width = self._data_col_widths[0]
+        coverage_width = self._data_col_widths[4]
         for i, row in enumerate(table_data):
             if i > 0 and len(row) > 0:  # Skip header row
-                # Wrap provider name (first column) in Paragraph with smaller font
-                provider_name = str(row[0])
-                table_data[i][0] = Paragraph(provider_name, table_cell_style)
+                table_data[i][0] = self._fit_cell(row[0], table_cell_style, name_width, 8)
                 
-                # Wrap coverage values if they're very long numbers
                 if len(row) > 4:  # Coverage column
-                    coverage_val = str(row[4])
-                    if len(coverage_val) > 10:  # Long number
-                        table_data[i][4] = Paragraph(coverage_val, table_cell_style)
+                    table_data[i][4] = self._fit_cell(row[4], table_cell_style, coverage_width, 8)
         
         # CRITICAL FIX: Create table with dynamic row heights and explicit spacing
-        data_table_obj = Table(table_data, colWidths=col_widths, repeatRows=1, rowHeights=None, spaceBefore=0, spaceAfter=0)
-        
-        # EXACT UI COLORS AND STYLING WITH ENHANCED VERTICAL SPACING
-        data_style = [
-            # Header row - Dark green background (#4A7C2A) with WHITE text
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#4A7C2A')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),  # WHITE, not whitesmoke
-            # FONTNAME and FONTSIZE removed here since headers are now Paragraphs with their own style
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),  # Increased padding for header
-            ('TOPPADDING', (0, 0), (-1, 0), 10),  # Increased padding for header
-            
-            # Alignment: Provider name LEFT, others CENTER
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),  # Provider name left-aligned
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),  # All other columns center-aligned
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # CRITICAL FIX: TOP alignment prevents overlap
-            
-            # CRITICAL FIX: Enable word wrap for all cells
-            ('WORDWRAP', (0, 0), (-1, -1), True),
-            
-            # Data rows - White and light grey alternating
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),  # Default white
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),  # Smaller font for data (8pt instead of 9pt)
-            
-            # Grid lines
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            
-            # CRITICAL FIX: Increased vertical padding to prevent overlap
-            ('LEFTPADDING', (0, 0), (-1, -1), 4),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-            ('TOPPADDING', (0, 1), (-1, -1), 10),  # Increased from 6 to 10
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 10),  # Increased from 6 to 10
-        ]
-        
-        # Add alternating row backgrounds (white and light grey #F5F5F5)
-        if len(table_data) > 2:
-            data_style.append(('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#F5F5F5')]))
-        
-        data_table_obj.setStyle(TableStyle(data_style))
-        story.append(data_table_obj)
+        data_table_obj = Table(table_data, colWidths=list(self._data_col_widths), repeatRows=1, rowHeights=None, spaceBefore=0, spaceAfter=0)
         
-        return story
+        # EXACT UI COLORS AND STYLING - alternating row backgrounds only with more than one data row
+        data_table_obj.setStyle(self._data_table_styles[len(table_data) > 2])
+        yield data_table_obj
     
     def _is_valid_item_text(self, text: str) -> bool:
         """
         Validate that item text is complete and not truncated.
         Returns True if text is valid for display, False if truncated/incomplete.
         """
-        if not text or not str(text).strip():
+        if not text:
             return False
         
-        text_str = str(text).strip()
-        
-        # Skip if too short (likely incomplete)
+        text_str = (text if isinstance(text, str) else str(text)).strip()
+        # Too short to be a complete item - decided without touching the cache
         if len(text_str) < 5:
             return False
         
-        # CRITICAL FIX: Skip truncated items with ellipsis markers
-        truncation_markers = [
-            '...',
-            '... all',
-            '... and',
-            '…',  # Unicode ellipsis
-            'all requirements',
-            'all conditions',
-            'all exclusions',
-            'all warranties'
-        ]
-        
-        text_lower = text_str.lower()
-        
-        # Check if text starts with ellipsis (incomplete beginning)
-        if text_str.startswith('...') or text_str.startswith('…'):
-            return False
-        
-        # Check if text is ONLY a truncation phrase
-        if text_lower in ['all requirements', 'all conditions', 'all exclusions', 'all warranties']:
-            return False
-        
-        # Check if text starts with "... " followed by truncation phrase
-        for marker in truncation_markers:
-            if text_lower.startswith(marker):
-                return False
-        
-        # If text is very short and contains ellipsis, skip it
-        if len(text_str) < 30 and '...' in text_str:
-            return False
-        
-        return True
+        # Benefit/exclusion strings repeat across providers - validate each unique one once
+        return _is_valid_item_text_cached(text_str)
     
     def _format_ui_table_cell(self, value: Any, column_key: str) -> str:
         """Format table cell values to match UI exactly."""
-        if value is None:
-            return "N/A"
-        
-        # Provider name - return as-is (string)
-        if column_key == "provider_name":
-            return str(value) if value else "N/A"
-        
-        # Score - format as decimal with 1 decimal place and % sign (UI shows "77.0%")
-        elif column_key == "score":
-            try:
-                score_val = float(value) if value else 0
-                return f"{score_val:.1f}%"  # Direct % symbol
-            except (ValueError, TypeError):
-                return "0.0%"
-        
-        # Premium - format as number without SAR prefix (UI shows just numbers with commas)
-        elif column_key == "premium":
-            try:
-                premium_val = float(value) if value else 0
-                # Format with commas, no decimal places (UI shows integers)
-                return f"{premium_val:,.0f}"
-            except (ValueError, TypeError):
-                return "0"
-        
-        # Rate - format as percentage or per mille (handle FLAT Premium case)
-        elif column_key == "rate":
-            if isinstance(value, str):
-                # CRITICAL FIX: Handle "FLAT Premium" case - don't add % sign
-                if 'FLAT' in value.upper() or 'PREMIUM' in value.upper():
-                    return value  # Return as-is for FLAT Premium
-                # If it already has % or ‰, return as-is
-                if '%' in value or '‰' in value:
-                    return value
-                # Try to parse as number if it's a numeric string
-                try:
-                    rate_val = float(value.replace('%', '').replace('‰', '').strip())
-                    if rate_val < 1:
-                        return f"{rate_val:.2f}\u2030"  # Unicode for ‰
-                    else:
-                        return f"{rate_val:.2f}%"  # Direct % symbol
-                except:
-                    return value  # Return original if can't parse
-            try:
-                rate_val = float(value) if value else 0
-                if rate_val < 1:
-                    return f"{rate_val:.2f}\u2030"  # Unicode for ‰
-                else:
-                    return f"{rate_val:.2f}%"  # Direct % symbol
-            except (ValueError, TypeError):
-                return "N/A"
-        
-        # Coverage - format as number with commas
-        elif column_key == "coverage":
-            try:
-                # If it's already a string with formatting, return as-is
-                if isinstance(value, str):
-                    return value
-                coverage_val = float(value) if value else 0
-                return f"{coverage_val:,.0f}".replace(",", ",")
-            except (ValueError, TypeError):
-                return "0"
-        
-        # Benefits, Exclusions, Warranties - show count only (integer)
-        elif column_key in ["benefits", "exclusions", "warranties"]:
-            try:
-                count_val = int(value) if value else 0
-                return str(count_val)
-            except (ValueError, TypeError):
-                return "0"
-        
-        # Rank - show integer
-        elif column_key == "rank":
-            try:
-                rank_val = int(value) if value else 0
-                return str(rank_val)
-            except (ValueError, TypeError):
-                return "0"
-        
-        # Default - return as string
-        return str(value) if value else "N/A"
+        # Repeated primitive cells are served from the cache. Other values (Decimal, lists, dicts)
+        # are formatted directly, so they keep the numeric parsing and fallbacks of their column.
+        if value is None or isinstance(value, (str, int, float)):
+            return _format_ui_table_cell_cached(column_key, value)
+        return _format_ui_table_cell_value(column_key, value)
     
     def _format_table_cell_value(self, value: Any, column_name: str) -> str:
-        """Format table cell values with proper formatting (NO TRUNCATION - use Paragraph wrapping)."""
-        if value is None:
-            return "N/A"
-        
-        col_lower = str(column_name).lower()
+        """
+        Format table cell values with proper formatting (NO TRUNCATION - use Paragraph wrapping).
         
-        # Format numbers
-        if isinstance(value, (int, float)):
-            if 'premium' in col_lower:
-                return f"SAR {value:,.2f}"
-            elif 'coverage' in col_lower:
-                return f"{value:,.0f}"
-            elif 'rate' in col_lower:
-                if isinstance(value, float) and value < 1:
-                    return f"{value:.2f}\u2030"  # Unicode for ‰
-                return f"{value:.2f}%"  # Direct % symbol
-            elif 'score' in col_lower:
-                return f"{value:.1f}"
-            else:
-                return f"{value:,.0f}"
+        Table builders should resolve _formatter_for_column() once per column and apply it to
+        every cell in that column instead of calling this per cell.
+        """
+        return _formatter_for_column(column_name)(value)
+    
+    def _fit_cell(self, text: Any, style: ParagraphStyle, col_width: float, padding: float) -> Any:
+        """
+        Return a table cell: the plain string when it fits on one line of the column, otherwise a
+        wrapping Paragraph in style.
         
-        # CRITICAL FIX: Return full string WITHOUT truncation
-        # ReportLab Paragraph will handle text wrapping automatically
-        return str(value)
+        Plain cells are drawn by the table directly, skipping paragraph parsing and layout, so
+        this is only used where the table's body font matches style's font and size.
+        """
+        text = str(text)
+        if ('<' not in text and '&' not in text
+                and pdfmetrics.stringWidth(text, style.fontName, style.fontSize) <= col_width - padding):
+            return text
+        return Paragraph(escape(text), style)
     
-    def _build_side_by_side_section(self, comparison_data: Dict[str, Any]) -> List:
+    def _build_side_by_side_section(self, view: _ComparisonView) -> Iterator:
         """Build side-by-side comparison section."""
-        story = []
         
         title = Paragraph("Side-by-Side Comparison", self.styles['SectionHeading'])
-        story.append(title)
-        story.append(Spacer(1, 0.15*inch))
+        yield title
+        yield Spacer(1, 0.15*inch)
         
-        side_by_side = comparison_data.get("side_by_side", {})
+        side_by_side = view.side_by_side
         if not side_by_side:
-            story.append(Paragraph("No side-by-side data available.", self.styles['CustomBodyText']))
-            return story
+            yield Paragraph("No side-by-side data available.", self.styles['CustomBodyText'])
+            return
         
         # Providers list (NO HAKIM SCORE)
-        providers = side_by_side.get("providers", [])
+        providers = view.providers
         if providers:
-            story.append(Paragraph("Providers", self.styles['SubsectionHeading']))
-            story.append(Spacer(1, 0.1*inch))
+            yield Paragraph("Providers", self.styles['SubsectionHeading'])
+            yield Spacer(1, 0.1*inch)
             
             provider_data = [["Provider", "Score", "Premium (SAR)", "Rate"]]
             
-            for provider in providers:
-                name = provider.get("name", "N/A")
-                score = provider.get("score", 0)
-                premium = provider.get("premium", 0)
-                rate = provider.get("rate", "N/A")
-                
-                # CRITICAL FIX: Wrap provider name in Paragraph for text wrapping
-                name_paragraph = Paragraph(name, self.styles['CustomBodyText'])
-                
-                provider_data.append([
-                    name_paragraph,
-                    f"{float(score):.1f}" if score else "N/A",
-                    f"{float(premium):,.2f}" if premium else "0.00",
-                    str(rate) if rate else "N/A"
-                ])
+            # Format column by column, then zip the columns into table rows
+            fmt = _format_or_default
+            # CRITICAL FIX: long names wrap instead of overflowing the cell (default 6pt side padding)
+            name_style = self._styles_cache['provider_name']
+            name_width = self._provider_col_widths[0]
+            names = [self._fit_cell(provider.get("name", "N/A"), name_style, name_width, 12) for provider in providers]
+            scores = [fmt(provider.get("score"), _FMT_1F, "N/A") for provider in providers]
+            premiums = [fmt(provider.get("premium"), _FMT_2F, "0.00") for provider in providers]
+            rates = [str(provider["rate"]) if provider.get("rate") else "N/A" for provider in providers]
+            provider_data.extend(map(list, zip(names, scores, premiums, rates)))
             
             # Ensure table fits margins
-            available_width = self.page_width - 1.8*inch
-            provider_table = Table(provider_data, colWidths=[
-                available_width * 0.4,
-                available_width * 0.2,
-                available_width * 0.25,
-                available_width * 0.15
-            ])
-            provider_style = [
-                ('BACKGROUND', (0, 0), (-1, 0), HexColor('#4A7C2A')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),  # Provider name left-aligned
-                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),  # Other columns center
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('WORDWRAP', (0, 0), (-1, -1), True),  # CRITICAL FIX: Enable word wrap
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ]
-            if len(provider_data) > 2:
-                provider_style.append(('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#F5F5F5')]))
-            provider_table.setStyle(TableStyle(provider_style))
-            story.append(provider_table)
-            story.append(Spacer(1, 0.15*inch))
+            provider_table = Table(provider_data, colWidths=list(self._provider_col_widths))
+            # Alternating row backgrounds only with more than one data row
+            provider_table.setStyle(self._provider_table_styles[len(provider_data) > 2])
+            yield provider_table
+            yield Spacer(1, 0.15*inch)
         
-        # Comparison matrix
+        # Comparison matrix - premium comparison is its only content, so skip the heading without it
         comparison_matrix = side_by_side.get("comparison_matrix", {})
-        if comparison_matrix:
-            story.append(Paragraph("Comparison Matrix", self.styles['SubsectionHeading']))
-            
-            # Premium comparison
-            if "premium" in comparison_matrix:
-                premium_data = comparison_matrix["premium"]
-                if premium_data:
-                    table_data = [["Provider", "Premium (SAR)"]]
-                    for item in premium_data:
-                        provider = item.get("provider", "N/A")
-                        premium = item.get("formatted", item.get("value", "N/A"))
-                        # CRITICAL FIX: Wrap provider name in Paragraph
-                        provider_paragraph = Paragraph(provider, self.styles['CustomBodyText'])
-                        table_data.append([provider_paragraph, premium])
-                    
-                    # Ensure table fits within margins
-                    available_width = self.page_width - 1.8*inch
-                    premium_table = Table(table_data, colWidths=[available_width * 0.5, available_width * 0.5])
-                    premium_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), HexColor('#6B9F3D')),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (0, -1), 'LEFT'),  # Provider column left
-                        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),  # Other columns center
-                        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                        ('WORDWRAP', (0, 0), (-1, -1), True),  # CRITICAL FIX: Enable word wrap
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, 0), 8),
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                                                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                    ]))
-                    story.append(premium_table)
-                    story.append(Spacer(1, 0.15*inch))
+        premium_data = comparison_matrix.get("premium") if comparison_matrix else None
+        if not premium_data:
+            return
         
-        return story
+        yield Paragraph("Comparison Matrix", self.styles['SubsectionHeading'])
+        
+        table_data = [["Provider", "Premium (SAR)"]]
+        # The table sets no body font, so cells use ReportLab's 10pt Helvetica, as in the body style
+        body_style = self._body_style
+        name_width = self._premium_col_widths[0]
+        for item in premium_data:
+            provider = item.get("provider", "N/A")
+            premium = item.get("formatted", item.get("value", "N/A"))
+            table_data.append([self._fit_cell(provider, body_style, name_width, 12), premium])
+        
+        # Ensure table fits within margins
+        premium_table = Table(table_data, colWidths=list(self._premium_col_widths))
+        premium_table.setStyle(self._premium_table_style)
+        yield premium_table
+        yield Spacer(1, 0.15*inch)
     
-    def _build_analytics_section(self, comparison_data: Dict[str, Any]) -> List:
+    def _build_analytics_section(self, view: _ComparisonView) -> Iterator:
         """Build analytics section with Overall Score Comparison only (removed duplicated tables per client requirement)."""
-        story = []
         
         title = Paragraph("Score Comparison", self.styles['SectionHeading'])
-        story.append(title)
-        story.append(Spacer(1, 0.15*inch))
+        yield title
+        yield Spacer(1, 0.15*inch)
         
-        summary = comparison_data.get("summary", {})
-        ranking = summary.get("ranking", []) if summary else []
+        ranking = view.ranking
         
         # Overall Score Comparison (only table kept per client requirement)
-        if ranking:
-            story.append(Paragraph("Overall Score Comparison", self.styles['SubsectionHeading']))
-            story.append(Spacer(1, 0.1*inch))
-            
-            table_data = [["Provider", "Score", "Rank"]]
-            for item in ranking[:10]:
-                if isinstance(item, dict):
-                    provider = item.get("company", "N/A")
-                    score = item.get("score", 0)
-                    rank = item.get("rank", "N/A")
-                    # CRITICAL FIX: Wrap provider name in Paragraph
-                    provider_paragraph = Paragraph(provider, self.styles['CustomBodyText'])
-                    table_data.append([provider_paragraph, f"{score:.2f}", str(rank)])
-            
-            if len(table_data) > 1:
-                available_width = self.page_width - 1.8*inch
-                score_table = Table(table_data, colWidths=[available_width * 0.5, available_width * 0.3, available_width * 0.2])
-                score_style = [
-                    ('BACKGROUND', (0, 0), (-1, 0), HexColor('#6B9F3D')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (0, -1), 'LEFT'),  # Provider column left
-                    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),  # Other columns center
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('WORDWRAP', (0, 0), (-1, -1), True),  # CRITICAL FIX: Enable word wrap
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 8),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ]
-                if len(table_data) > 2:
-                    score_style.append(('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#F5F5F5')]))
-                score_table.setStyle(TableStyle(score_style))
-                story.append(score_table)
-                story.append(Spacer(1, 0.2*inch))
+        rank_items = self._normalize_ranking(ranking, 10) if ranking else []
+        if not rank_items:
+            return
         
-        # Key Insights section removed per client requirement - Final Technical Recommendation is in _build_detailed_comparison_factors
+        yield Paragraph("Overall Score Comparison", self.styles['SubsectionHeading'])
+        yield Spacer(1, 0.1*inch)
+        
+        table_data = [["Provider", "Score", "Rank"]]
+        # The table sets no body font, so cells use ReportLab's 10pt Helvetica, as in the body style
+        body_style = self._body_style
+        name_width = self._score_col_widths[0]
+        for item in rank_items:
+            rank = "N/A" if item.rank is None else item.rank
+            table_data.append([self._fit_cell(item.company, body_style, name_width, 12), _FMT_2F_PLAIN(item.score), str(rank)])
         
-        return story
+        score_table = Table(table_data, colWidths=list(self._score_col_widths))
+        score_table.setStyle(self._score_table_styles[len(table_data) > 2])
+        yield score_table
+        yield Spacer(1, 0.2*inch)
+        
+        # Key Insights section removed per client requirement - Final Technical Recommendation is in _build_detailed_comparison_factors
 
 
 # Global singleton instance